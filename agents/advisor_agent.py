@@ -3,10 +3,11 @@ from utils.visualization_simple import SimpleVisualizer
 from utils.predictive_analytics_simple import SimplePredictiveAnalytics
 from langchain_google_genai import ChatGoogleGenerativeAI 
 from langchain_core.prompts import PromptTemplate 
+from utils.tracing import trace_node, invoke_llm, span 
+from utils import serialization 
 from datetime import date 
-import json
-import os
 
+@trace_node("advisor_agent") 
 def advisor_agent_node(state): 
     """ 
     A LangGraph node representing the AdvisorAgent. 
@@ -30,7 +31,8 @@ def advisor_agent_node(state):
 
         # Generate predictive analytics
         print("[AdvisorAgent] -> Generating predictive analytics...")
-        forecast_data = predictor.generate_comprehensive_forecast(product_line, competitors)
+        with span("model", "comprehensive_forecast", engine="simple"):
+            forecast_data = predictor.generate_comprehensive_forecast(product_line, competitors)
         
         # Generate visualizations
         print("[AdvisorAgent] -> Creating advanced visualizations...")
@@ -80,6 +82,16 @@ def advisor_agent_node(state):
         historical_context_str = "No historical data available for comparison." 
         if historical_data: 
             historical_context_str = f"Last week's trends: {historical_data.get('trends', 'N/A')}\nLast week's sentiment: {historical_data.get('reviews', {}).get('overall_sentiment', 'N/A')}" 
+        history_series = state.get("history_timeseries") or {} 
+        if history_series.get("dates"): 
+            sentiment_totals = {label: sum(counts) for label, counts in history_series["sentiment_counts"].items() if sum(counts)} 
+            historical_context_str += ( 
+                f"\nLast {len(history_series['dates'])} weeks ({sum(history_series['snapshots'])} analyses): " 
+                f"sentiment counts {sentiment_totals}, " 
+                f"competitors added {sum(history_series['competitors_added'])}, " 
+                f"removed {sum(history_series['competitors_removed'])}, " 
+                f"weekly trend overlap {history_series['trend_overlap']}" 
+            ) 
         
         # Format predictive insights
         predictive_insights = "No predictive analytics available."
@@ -98,14 +110,14 @@ def advisor_agent_node(state):
     "review_summary", "trends", "historical_context", "predictive_insights"] 
         ) 
          
-        recommendations = llm.invoke(prompt.format( 
+        recommendations = invoke_llm(llm, prompt.format( 
             product_line=product_line, 
             competitors=", ".join(competitors), 
             review_summary=reviews.get("overall_summary", "No review data available."), 
             trends="\n".join(trends), 
             historical_context=historical_context_str,
             predictive_insights=predictive_insights
-        )).content.strip() 
+        ), "advisor_recommendations").content.strip() 
          
         print("[AdvisorAgent] -> Generating final PDF report...") 
          
@@ -137,10 +149,8 @@ def advisor_agent_node(state):
             }
             
             # Save to data directory
-            os.makedirs('data', exist_ok=True)
-            viz_file = f"data/{product_line.replace(' ', '_').replace('/', '_')}_visualization_data.json"
-            with open(viz_file, 'w') as f:
-                json.dump(viz_data, f, indent=2, default=str)
+            viz_file = f"data/{product_line.replace(' ', '_').replace('/', '_')}_visualization_data{serialization.file_extension()}"
+            serialization.dump_file(viz_data, viz_file)
             
             print(f"[AdvisorAgent] -> Visualization data saved to {viz_file}")
         except Exception as e:
@@ -1,7 +1,9 @@
 from utils.scraper import search_serpapi
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import PromptTemplate
+from utils.tracing import trace_node, invoke_llm
 
+@trace_node("competitor_agent")
 def competitor_agent_node(state):
     """
     A LangGraph node representing the CompetitorAgent.
@@ -68,12 +70,14 @@ Competitors:
     )
 
     competitor_list_str = (
-        llm.invoke(
+        invoke_llm(
+            llm,
             prompt.format(
                 product_line=product_line,
                 search_results=aggregated_results,
                 preferred_region=preferred_region,
-            )
+            ),
+            "competitor_selection",
         ).content.strip()
     )
 
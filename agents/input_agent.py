@@ -1,10 +1,12 @@
 from langchain_core.prompts import PromptTemplate 
 from langchain_google_genai import ChatGoogleGenerativeAI 
 from langchain_core.pydantic_v1 import BaseModel, Field 
+from utils.tracing import trace_node, invoke_llm 
  
 class InputAnalysis(BaseModel): 
     product_line: str = Field(description="The validated and refined product line") 
  
+@trace_node("input_agent") 
 def input_agent_node(state): 
     """ 
     A LangGraph node representing the InputAgent. 
@@ -26,7 +28,7 @@ validate and refine a given product line.
         input_variables=["product_line"] 
     ) 
      
-    refined_product_line = llm.invoke(prompt.format(product_line=state['product_line'])).content.strip() 
+    refined_product_line = invoke_llm(llm, prompt.format(product_line=state['product_line']), "refine_product_line").content.strip() 
      
     print(f"[InputAgent] -> Refined product line: {refined_product_line}") 
      
@@ -1,6 +1,8 @@
 from mcp_server.memory_store import MemoryStore 
-from datetime import date 
+from datetime import date, timedelta 
+from utils.tracing import trace_node 
  
+@trace_node("memory_agent") 
 def memory_agent_node(state: dict, memory_store: MemoryStore): 
     """ 
     A LangGraph node representing the MemoryAgent. 
@@ -12,14 +14,22 @@ data.
     try:
         product_line = state.get("product_line") 
          
-        # Attempt to retrieve historical data 
-        historical_data = memory_store.get_data(product_line) 
+        # Prefer the snapshot from a week ago; fall back to the latest run 
+        week_ago = date.today() - timedelta(days=7) 
+        historical_data = memory_store.get_as_of(product_line, week_ago) or memory_store.get_data(product_line) 
         if historical_data: 
             print(f"[MemoryAgent] -> Found historical data from {historical_data['date']}.") 
             state["historical_data"] = historical_data 
         else:
             print("[MemoryAgent] -> No historical data found for this product line.")
 
+        # Longer-range view for the advisor: weekly series over the last six months 
+        try:
+            state["history_timeseries"] = memory_store.query_timeseries(
+                product_line, start=date.today() - timedelta(days=180), freq="W")
+        except Exception as e:
+            print(f"[MemoryAgent] -> Time-series query failed: {e}")
+
         # Store the current state for future comparison 
         current_data = { 
             "date": date.today().strftime("%Y-%m-%d"), 
@@ -3,6 +3,7 @@ from utils.scraper import scrape_reviews
 from utils.sentiment import analyze_sentiment 
 from langchain_google_genai import ChatGoogleGenerativeAI 
 from langchain_core.prompts import PromptTemplate 
+from utils.tracing import trace_node, invoke_llm 
  
 def summarize_reviews(product_name, reviews, llm): 
     """Summarizes a list of reviews for a single product.""" 
@@ -22,13 +23,14 @@ sentiment score (Positive, Negative, or Mixed).
     ) 
      
     review_text = "\n".join(reviews) 
-    summary_and_sentiment = llm.invoke(prompt.format(product_name=product_name, reviews=review_text)).content.strip() 
+    summary_and_sentiment = invoke_llm(llm, prompt.format(product_name=product_name, reviews=review_text), "review_summary").content.strip() 
      
     # Simple post-processing to extract sentiment 
     sentiment_score = analyze_sentiment(review_text) 
      
     return {"sentiment": sentiment_score, "summary": summary_and_sentiment} 
  
+@trace_node("review_agent") 
 def review_agent_node(state): 
     """ 
     A LangGraph node representing the ReviewAgent. 
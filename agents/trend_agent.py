@@ -1,7 +1,9 @@
 from utils.social import get_google_news_trends 
 from langchain_google_genai import ChatGoogleGenerativeAI 
 from langchain_core.prompts import PromptTemplate 
+from utils.tracing import trace_node, invoke_llm 
  
+@trace_node("trend_agent") 
 def trend_agent_node(state): 
     """ 
     A LangGraph node representing the TrendAgent. 
@@ -42,7 +44,7 @@ def trend_agent_node(state):
             ) 
              
             headlines_text = "\n".join([article["title"] for article in news_articles]) 
-            trends_list_str = llm.invoke(prompt.format(product_line=product_line, headlines=headlines_text)).content.strip() 
+            trends_list_str = invoke_llm(llm, prompt.format(product_line=product_line, headlines=headlines_text), "trend_summary").content.strip() 
 
             # Normalize into clean bullet points without numeric prefixes or extra text
             raw_lines = [line.strip() for line in trends_list_str.split("\n") if line.strip()]
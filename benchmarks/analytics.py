@@ -0,0 +1,218 @@
+"""
+Offline benchmark of the predictive analytics engines.
+
+Times every forecasting method of SimplePredictiveAnalytics ("simple") and
+PredictiveAnalytics ("forest" and "ets" engines) across history lengths and
+forecast horizons, and reports wall time (best and median of --repeat runs),
+peak traced memory, memory still held when the call returns, and the number
+of blocks allocated during the call that are still alive (tracemalloc, in a
+separate run so tracing does not distort the timings).
+
+Every run uses a fresh, seeded instance with the model registry and forecast
+cache disabled, so forest timings include training and nothing touches the
+network or data/.
+Method arguments that don't apply are fixed: the simple engine always
+generates 24 months of history inside its forecasts, growth horizons are
+rounded up to whole years for PredictiveAnalytics, and comprehensive
+forecasts use each engine's default horizons.
+
+    python -m benchmarks.analytics --save benchmarks/baseline.json
+    python -m benchmarks.analytics --compare benchmarks/baseline.json --tolerance 0.25
+    python -m benchmarks.analytics --engines ets --methods predict_sales_forecast --months 24 240
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from utils.predictive_analytics import HistoricalContext, PredictiveAnalytics
+from utils.predictive_analytics_simple import SimplePredictiveAnalytics
+
+PRODUCT_LINE = "benchmark brake pads"
+COMPETITORS = ["Competitor A", "Competitor B", "Competitor C"]
+ENGINES = ["simple", "forest", "ets"]
+METHODS = [
+    "generate_historical_data",
+    "predict_sales_forecast",
+    "predict_market_growth",
+    "predict_price_trends",
+    "analyze_seasonal_demand",
+    "generate_comprehensive_forecast",
+]
+# Methods whose result depends on the forecast horizon
+HORIZON_METHODS = {"predict_sales_forecast", "predict_market_growth", "predict_price_trends"}
+# Changes smaller than these are treated as noise when comparing against a baseline
+NOISE_FLOOR_MS = 1.0
+NOISE_FLOOR_KIB = 64
+
+
+def make_call(engine, method, months, horizon, seed=42):
+    """Zero-argument callable for one cold call; instance and history setup happen here, untimed."""
+    if engine == "simple":
+        analytics = SimplePredictiveAnalytics(seed=seed)
+        calls = {
+            "generate_historical_data": lambda: analytics.generate_historical_data(PRODUCT_LINE, months),
+            "predict_sales_forecast": lambda: analytics.predict_sales_forecast(PRODUCT_LINE, horizon),
+            "predict_market_growth": lambda: analytics.predict_market_growth(PRODUCT_LINE, horizon),
+            "predict_price_trends": lambda: analytics.predict_price_trends(PRODUCT_LINE, horizon),
+            "analyze_seasonal_demand": lambda: analytics.analyze_seasonal_demand(PRODUCT_LINE),
+            "generate_comprehensive_forecast": lambda: analytics.generate_comprehensive_forecast(PRODUCT_LINE,
+                                                                                                 COMPETITORS),
+        }
+        return calls[method]
+
+    analytics = PredictiveAnalytics(seed=seed, registry=False, engine=engine, forecast_cache=False)
+    if method == "generate_historical_data":
+        return lambda: analytics.generate_historical_data(PRODUCT_LINE, months)
+    history = analytics.generate_historical_data(PRODUCT_LINE, months)
+    context = HistoricalContext(PRODUCT_LINE, history)
+    calls = {
+        "predict_sales_forecast": lambda: analytics.predict_sales_forecast(PRODUCT_LINE, horizon, context=context),
+        "predict_market_growth": lambda: analytics.predict_market_growth(PRODUCT_LINE, math.ceil(horizon / 12),
+                                                                         context=context),
+        "predict_price_trends": lambda: analytics.predict_price_trends(PRODUCT_LINE, horizon, context=context),
+        "analyze_seasonal_demand": lambda: analytics.analyze_seasonal_demand(PRODUCT_LINE, context=context),
+        "generate_comprehensive_forecast": lambda: analytics.generate_comprehensive_forecast(
+            PRODUCT_LINE, COMPETITORS, history=history),
+    }
+    return calls[method]
+
+
+def cases(engines, methods, months_list, horizons):
+    """(engine, method, history months, horizon) combinations, skipping parameters a method ignores."""
+    for engine in engines:
+        for method in methods:
+            uses_history = engine != "simple" or method == "generate_historical_data"
+            for months in (months_list if uses_history else [None]):
+                for horizon in (horizons if method in HORIZON_METHODS else [None]):
+                    yield engine, method, months, horizon
+
+
+def warm_up(engines):
+    """One untimed forecast per engine, so lazy imports (pandas, scikit-learn) are not charged to a case."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        for engine in engines:
+            make_call(engine, "generate_comprehensive_forecast", 24, 12)()
+
+
+def measure(engine, method, months, horizon, repeat):
+    """Timings over `repeat` cold calls, then one traced call for memory."""
+    timings = []
+    quiet = io.StringIO()
+    for _ in range(repeat):
+        call = make_call(engine, method, months or 24, horizon or 12)
+        with contextlib.redirect_stdout(quiet):
+            start = time.perf_counter()
+            call()
+            timings.append((time.perf_counter() - start) * 1000)
+
+    call = make_call(engine, method, months or 24, horizon or 12)
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(quiet):
+            result = call()
+        current, peak = tracemalloc.get_traced_memory()
+        blocks = len(tracemalloc.take_snapshot().traces)
+    finally:
+        tracemalloc.stop()
+    del result
+
+    return {
+        "engine": engine,
+        "method": method,
+        "history_months": months,
+        "horizon": horizon,
+        "wall_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "peak_kib": round(peak / 1024, 1),
+        "retained_kib": round(current / 1024, 1),
+        "allocated_blocks": blocks,
+    }
+
+
+def environment():
+    versions = {"python": platform.python_version(), "numpy": np.__version__}
+    for name in ("pandas", "sklearn"):
+        try:
+            versions[name] = __import__(name).__version__
+        except ImportError:
+            versions[name] = None
+    return dict(versions, machine=platform.machine(), system=platform.system(),
+                created=datetime.now().isoformat(timespec="seconds"))
+
+
+def case_key(result):
+    return (result["engine"], result["method"], result["history_months"], result["horizon"])
+
+
+def compare(results, baseline, tolerance):
+    """Prints time and memory ratios against a baseline; returns the cases that regressed."""
+    previous = {case_key(entry): entry for entry in baseline["results"]}
+    regressions = []
+    print(f"\n{'engine':<7} {'method':<32} {'months':>6} {'horizon':>7} {'time x':>7} {'peak x':>7}  status")
+    for result in results:
+        old = previous.get(case_key(result))
+        if old is None:
+            continue
+        time_ratio = result["wall_ms"] / max(old["wall_ms"], 1e-9)
+        peak_ratio = result["peak_kib"] / max(old["peak_kib"], 1e-9)
+        slower = time_ratio > 1 + tolerance and result["wall_ms"] - old["wall_ms"] > NOISE_FLOOR_MS
+        larger = peak_ratio > 1 + tolerance and result["peak_kib"] - old["peak_kib"] > NOISE_FLOOR_KIB
+        status = "REGRESSION" if slower or larger else "ok"
+        if status != "ok":
+            regressions.append(result)
+        print(f"{result['engine']:<7} {result['method']:<32} {str(result['history_months'] or '-'):>6} "
+              f"{str(result['horizon'] or '-'):>7} {time_ratio:>7.2f} {peak_ratio:>7.2f}  {status}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the predictive analytics engines.")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=ENGINES)
+    parser.add_argument("--methods", nargs="+", choices=METHODS, default=METHODS)
+    parser.add_argument("--months", type=int, nargs="+", default=[24, 60, 120], help="history lengths")
+    parser.add_argument("--horizons", type=int, nargs="+", default=[6, 12, 24], help="forecast months")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", metavar="PATH", help="write results as a baseline JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative slowdown or memory growth before a case is a regression")
+    args = parser.parse_args(argv)
+
+    warm_up(args.engines)
+    results = []
+    print(f"{'engine':<7} {'method':<32} {'months':>6} {'horizon':>7} {'best ms':>10} {'median ms':>10} "
+          f"{'peak KiB':>10} {'held KiB':>9} {'blocks':>7}")
+    for engine, method, months, horizon in cases(args.engines, args.methods, args.months, args.horizons):
+        result = measure(engine, method, months, horizon, args.repeat)
+        results.append(result)
+        print(f"{engine:<7} {method:<32} {str(months or '-'):>6} {str(horizon or '-'):>7} "
+              f"{result['wall_ms']:>10.2f} {result['median_ms']:>10.2f} {result['peak_kib']:>10.1f} "
+              f"{result['retained_kib']:>9.1f} {result['allocated_blocks']:>7}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "repeat": args.repeat, "results": results}, f, indent=2)
+        print(f"\nBaseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
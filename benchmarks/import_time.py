@@ -0,0 +1,69 @@
+"""
+Import-time budget for the CLI and dashboard entry points.
+
+Each module is imported in a fresh interpreter; the check fails (exit code 1)
+when the best of --repeat imports exceeds --budget seconds, when the import
+fails, or when it loads a heavy dependency that should only be imported on
+first use (scikit-learn, transformers, torch, yfinance).
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --budget 1.5 --modules main
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+DEFAULT_MODULES = ["main", "dashboard_voice"]
+DEFAULT_BUDGET_SECONDS = 3.0
+DEFERRED_MODULES = ["sklearn", "transformers", "torch", "yfinance"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {deferred!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module):
+    """Seconds to import `module` in a new interpreter, and which deferred modules it loaded."""
+    result = subprocess.run([sys.executable, "-c", _PROBE.format(module=module, deferred=DEFERRED_MODULES)],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        error = (result.stderr.strip().splitlines() or ["unknown error"])[-1]
+        raise RuntimeError(error)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check entry-point import time against a budget.")
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_SECONDS, help="seconds per module")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    failed = False
+    print(f"{'module':<34} {'seconds':>8}  status")
+    for module in args.modules:
+        try:
+            runs = [measure(module) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{module:<34} {'-':>8}  FAIL import error: {e}")
+            failed = True
+            continue
+        seconds = min(run["seconds"] for run in runs)
+        problems = []
+        if seconds > args.budget:
+            problems.append(f"over budget ({args.budget:.2f}s)")
+        if runs[0]["loaded"]:
+            problems.append(f"loads {', '.join(runs[0]['loaded'])} at import")
+        failed = failed or bool(problems)
+        print(f"{module:<34} {seconds:>8.2f}  {'FAIL ' + '; '.join(problems) if problems else 'ok'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Memory per row of the daily history used for forecasting, before and after
+compact dtypes (see HISTORY_DTYPES in utils.predictive_analytics).
+
+"Before" is the previous layout: int64 calendar fields and sales, float64
+price and growth rate, and product_line as Python strings, as a DataFrame
+built from row dicts gets them. "After" is the layout generate_historical_data
+and compact_history now produce.
+
+    python -m benchmarks.memory
+    python -m benchmarks.memory --products 500 --months 60
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from utils.predictive_analytics import PredictiveAnalytics, compact_history
+
+LEGACY_DTYPES = {
+    'sales': np.int64,
+    'price': np.float64,
+    'growth_rate': np.float64,
+    'month': np.int64,
+    'quarter': np.int64,
+    'day_of_week': np.int64,
+    'product_line': object
+}
+
+
+def stacked_history(products, months, seed=42):
+    """Daily history for `products` product lines, stacked into one frame."""
+    analytics = PredictiveAnalytics(seed=seed, registry=False)
+    frames = [analytics.generate_historical_data(f"Product {i}", months).assign(product_line=f"Product {i}")
+              for i in range(products)]
+    return pd.concat(frames, ignore_index=True)
+
+
+def bytes_per_row(frame):
+    """Deep memory usage per row for each column, plus the total."""
+    usage = frame.memory_usage(deep=True, index=False) / len(frame)
+    return dict(usage.items(), total=usage.sum())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report forecasting history memory per row.")
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--months", type=int, default=36)
+    args = parser.parse_args(argv)
+
+    history = stacked_history(args.products, args.months)
+    before = bytes_per_row(history.astype(LEGACY_DTYPES))
+    compact = compact_history(history)
+    after = bytes_per_row(compact)
+
+    print(f"{len(history):,} rows ({args.products} product lines x {args.months} months of daily data)\n")
+    print(f"{'column':<14} {'before':>10} {'after':>10} {'dtype':>10}")
+    for column in before:
+        dtype = str(compact[column].dtype) if column in compact else ""
+        print(f"{column:<14} {before[column]:>10.1f} {after[column]:>10.1f} {dtype:>10}")
+    total_before = before["total"] * len(history)
+    total_after = after["total"] * len(history)
+    print(f"\nbytes per row {before['total']:.1f} -> {after['total']:.1f} "
+          f"({1 - after['total'] / before['total']:.0%} smaller); "
+          f"{total_before / 2**20:.1f} MiB -> {total_after / 2**20:.1f} MiB in total")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Panel forecasts (PredictiveAnalytics.generate_panel_forecast) over many
+product lines whose histories have different lengths, as real product lines
+do: with --months 6 18 36, a third of the series has 6 months of history, a
+third 18 and a third 36, all ending today. Shorter series start later, so the
+monthly matrices have leading gaps, and series with under two years of data
+get no seasonal component from the ets engine.
+
+Reports wall time per engine and checks that every forecast value is finite
+and sales are non-negative; exits with 1 if any is not.
+
+    python -m benchmarks.panel
+    python -m benchmarks.panel --products 300 --months 6 18 36 60 --engines ets
+"""
+
+import argparse
+import contextlib
+import io
+import math
+import sys
+import time
+
+from utils.predictive_analytics import ENGINES, PredictiveAnalytics
+
+
+def mixed_histories(products, months_list, seed=42):
+    """{product_line: daily history}, cycling through the history lengths in months_list."""
+    analytics = PredictiveAnalytics(seed=seed, registry=False)
+    return {f"Product {i}": analytics.generate_historical_data(f"Product {i}", months_list[i % len(months_list)])
+            for i in range(products)}
+
+
+def invalid_values(forecast):
+    """(product line, field) pairs holding a non-finite value or negative sales."""
+    problems = []
+    for name, result in forecast.items():
+        for field, rows, keys in (("sales_forecast", result['sales_forecast'],
+                                   ('predicted_sales', 'min_sales', 'max_sales')),
+                                  ("market_growth", result['market_growth'], ('predicted_growth', 'lower', 'upper')),
+                                  ("price_trends", result['price_trends'], ('predicted_price', 'lower', 'upper'))):
+            for row in rows:
+                values = [row[key] for key in keys if key in row]
+                if any(not math.isfinite(v) for v in values) or (field == "sales_forecast" and min(values) < 0):
+                    problems.append((name, field))
+                    break
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark panel forecasts over mixed-length histories.")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--products", type=int, default=60)
+    parser.add_argument("--months", type=int, nargs="+", default=[6, 18, 36], help="history lengths")
+    args = parser.parse_args(argv)
+
+    histories = mixed_histories(args.products, args.months)
+    print(f"{args.products} product lines, history lengths {', '.join(map(str, args.months))} months\n")
+    print(f"{'engine':<7} {'wall ms':>10}  check")
+    failed = False
+    for engine in args.engines:
+        analytics = PredictiveAnalytics(seed=42, registry=False, engine=engine)
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            forecast = analytics.generate_panel_forecast(histories=histories)
+            elapsed = (time.perf_counter() - start) * 1000
+        problems = invalid_values(forecast) if forecast else [("-", "no forecast")]
+        failed = failed or bool(problems)
+        status = "ok" if not problems else f"{len(problems)} invalid, e.g. {problems[0][0]} {problems[0][1]}"
+        print(f"{engine:<7} {elapsed:>10.1f}  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,7 @@ from datetime import datetime
 import config
 from graph.market_graph import MarketGraph
 from mcp_server.server import MCPServer
+from utils import tracing
 import speech_recognition as sr
 import pyttsx3
 import threading
@@ -222,7 +223,9 @@ def run_market_analysis(product_line):
         
         # Run analysis
         with st.spinner("Running MarketMate AI Analysis..."):
-            final_state = graph.run_graph(initial_state)
+            tracing.start_run()
+            with tracing.span("graph", "run_graph", product_line=product_line):
+                final_state = graph.run_graph(initial_state)
         
         return final_state, None
     except Exception as e:
@@ -504,7 +507,9 @@ def main():
                         
                         # Run analysis with progress tracking
                         print("Starting full market analysis...")
-                        final_state = graph.run_graph(initial_state)
+                        tracing.start_run()
+                        with tracing.span("graph", "run_graph", product_line=st.session_state.product_line):
+                            final_state = graph.run_graph(initial_state)
                         print("Analysis completed successfully!")
                         analysis_data = {
                             "competitors": final_state.get("competitors", []),
@@ -3,6 +3,7 @@ import datetime
 import config  # Import config to load API keys
 from graph.market_graph import MarketGraph 
 from mcp_server.server import MCPServer 
+from utils import tracing 
  
 def main(): 
     """ 
@@ -37,7 +38,10 @@ def main():
      
     # Run the graph 
     print("\n--- Starting MarketMate AI Analysis ---") 
-    final_state = graph.run_graph(initial_state) 
+    run_id = tracing.start_run() 
+    with tracing.span("graph", "run_graph", product_line=product_line): 
+        final_state = graph.run_graph(initial_state) 
+    print(f"--- Trace run id: {run_id} ---") 
     print("--- Analysis Complete ---") 
      
     # Final output summary 
@@ -0,0 +1,137 @@
+"""
+Bounded analysis log for the MCP server.
+Recent entries live in a fixed-size ring buffer, every entry is appended to a
+size-rotated JSONL file on disk, and per-analysis-type aggregates are updated
+incrementally as entries arrive.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+
+from mcp_server.concurrency import ShardedCounter, StripedLock
+from utils.rotating_log import RotatingJSONLWriter
+
+
+def _status_kind(status: str):
+    """Maps free-form statuses such as 'completed - found 3 competitors' to a bucket."""
+    word = (status or "").strip().split(" ", 1)[0].lower()
+    if word in ("started", "completed", "failed", "error"):
+        return "failed" if word == "error" else word
+    return "other"
+
+
+class AnalysisLog:
+    """
+    Ring buffer of recent analyses plus an append-only on-disk log.
+    Safe to use from many threads: aggregates are locked per analysis type
+    and the total is a sharded counter, so concurrent writers rarely contend.
+    """
+
+    def __init__(self, log_path=os.path.join("data", "mcp", "analysis_log.jsonl"),
+                 max_recent=200, max_bytes=2 * 1024 * 1024, backup_count=3,
+                 max_open_analyses=1000):
+        self.recent_entries = deque(maxlen=max_recent)
+        self.writer = RotatingJSONLWriter(log_path, max_bytes=max_bytes, backup_count=backup_count) if log_path else None
+        self.stats = {}
+        self.started_at = datetime.now().isoformat()
+        self._total = ShardedCounter()
+        self._type_locks = StripedLock()
+        self._recent_lock = threading.Lock()
+        self._open = OrderedDict()
+        self._open_lock = threading.Lock()
+        self._max_open = max_open_analyses
+
+        # Restore the most recent entries so the dashboard survives restarts
+        if self.writer:
+            try:
+                self.recent_entries.extend(self.writer.tail(max_recent))
+            except Exception as e:
+                print(f"[MCPServer] -> Could not restore analysis log: {e}")
+
+    @property
+    def total(self):
+        """
+        Entries logged since this process started. Not restored from disk: the
+        rotating log drops old files, so it cannot give a lifetime total.
+        """
+        return self._total.value()
+
+    def _stats_for(self, analysis_type):
+        stats = self.stats.get(analysis_type)
+        if stats is None:
+            stats = self.stats.setdefault(analysis_type, {
+                "count": 0,
+                "statuses": {"started": 0, "completed": 0, "failed": 0, "other": 0},
+                "latency_ms": {"count": 0, "total": 0.0, "min": None, "max": None, "mean": None},
+            })
+        return stats
+
+    def _record_latency(self, stats, latency_ms):
+        latency = stats["latency_ms"]
+        latency["count"] += 1
+        latency["total"] += latency_ms
+        latency["min"] = latency_ms if latency["min"] is None else min(latency["min"], latency_ms)
+        latency["max"] = latency_ms if latency["max"] is None else max(latency["max"], latency_ms)
+        latency["mean"] = latency["total"] / latency["count"]
+
+    def append(self, entry: dict):
+        """Adds an entry, updating aggregates in O(1)."""
+        analysis_type = entry.get("analysis_type", "unknown")
+        kind = _status_kind(entry.get("status", ""))
+
+        # Pair 'started' with the next terminal status for the same analysis to get a latency
+        key = (entry.get("product_line"), analysis_type)
+        now = time.perf_counter()
+        latency_ms = None
+        with self._open_lock:
+            if kind == "started":
+                self._open[key] = now
+                self._open.move_to_end(key)
+                while len(self._open) > self._max_open:
+                    self._open.popitem(last=False)
+            elif kind in ("completed", "failed"):
+                started = self._open.pop(key, None)
+                if started is not None:
+                    latency_ms = (now - started) * 1000.0
+        if latency_ms is not None:
+            entry["latency_ms"] = round(latency_ms, 3)
+
+        with self._type_locks.for_key(analysis_type):
+            stats = self._stats_for(analysis_type)
+            stats["count"] += 1
+            stats["statuses"][kind] += 1
+            if latency_ms is not None:
+                self._record_latency(stats, latency_ms)
+
+        with self._recent_lock:
+            self.recent_entries.append(entry)
+        self._total.increment()
+
+        if self.writer:
+            try:
+                self.writer.write(entry)
+            except Exception as e:
+                print(f"[MCPServer] -> Failed to persist analysis log entry: {e}")
+
+    def recent(self, n=5):
+        """Returns the last n entries, oldest first."""
+        if n <= 0:
+            return []
+        with self._recent_lock:
+            return list(self.recent_entries)[-n:]
+
+    def aggregates(self):
+        """Per-analysis-type counts and latencies since this process started."""
+        result = {}
+        for analysis_type, stats in list(self.stats.items()):
+            with self._type_locks.for_key(analysis_type):
+                result[analysis_type] = {
+                    "count": stats["count"],
+                    "statuses": dict(stats["statuses"]),
+                    "latency_ms": {k: (round(v, 3) if isinstance(v, float) else v)
+                                   for k, v in stats["latency_ms"].items()},
+                }
+        return result
@@ -0,0 +1,174 @@
+"""
+In-process read-through cache for memory stores.
+Entries are validated against the store's cheap version token (file
+mtime/size for MemoryStore, newest row id for SQLiteMemoryStore), so a write
+from another process is picked up on the next read without re-parsing
+unchanged snapshots.
+"""
+
+import itertools
+import json
+import threading
+from collections import OrderedDict
+
+from mcp_server.memory_store import product_key
+from utils.tracing import span
+
+
+class CachedMemoryStore:
+    """
+    LRU cache in front of any store exposing get_latest/get_as_of/get_history
+    and version() (or key_version() for an already resolved key). Eviction is
+    bounded by both entry count and approximate bytes.
+    Cached snapshots are shared between callers and must be treated as read-only.
+    Misses are always traced; one read in hit_span_every is traced even when it
+    hits, so spans and latency histograms see hits without a trace write per hit.
+    """
+    def __init__(self, store, max_entries=256, max_bytes=32 * 1024 * 1024, hit_span_every=64):
+        self.store = store
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hit_span_every = max(1, hit_span_every)
+        self._reads = itertools.count()
+        self._entries = OrderedDict()
+        self._keys_by_product = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __getattr__(self, name):
+        # Anything not cached (snapshot_count, close, ...) goes straight to the store
+        return getattr(self.store, name)
+
+    def _key(self, product_line):
+        # Spelling variants of a product line share cache entries when the store canonicalizes keys
+        resolve = getattr(self.store, "resolve_key", None)
+        return resolve(product_line) if resolve else product_key(product_line)
+
+    def _estimate_size(self, value):
+        try:
+            return len(json.dumps(value, default=str))
+        except (TypeError, ValueError):
+            return 1024
+
+    def _drop(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+        keys = self._keys_by_product.get(key[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_product[key[1]]
+
+    def _put(self, key, version, value):
+        size = self._estimate_size(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (version, value, size)
+        self._keys_by_product.setdefault(key[1], set()).add(key)
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _version(self, product_line, product):
+        key_version = getattr(self.store, "key_version", None)
+        return key_version(product) if key_version else self.store.version(product_line)
+
+    def _lookup(self, key, version):
+        """(True, value) for a valid cached entry, otherwise (False, None) after counting the miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and version is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                self._drop(key)
+                self.invalidations += 1
+            self.misses += 1
+        return False, None
+
+    def _read(self, operation, product_line, arg, loader):
+        product = self._key(product_line)
+        key = (operation, product, arg)
+        if next(self._reads) % self.hit_span_every == 0:
+            # Sampled read: traced whether it hits or not; a hit stands for hit_span_every hits
+            with span("memory", operation) as s:
+                version = self._version(product_line, product)
+                hit, value = self._lookup(key, version)
+                s.set_cache_hit(hit)
+                if hit:
+                    s.set(sample_every=self.hit_span_every)
+                    return value
+                value = loader()
+        else:
+            # Hits only touch in-memory counters; a span (and its trace write) is only paid on a miss
+            version = self._version(product_line, product)
+            hit, value = self._lookup(key, version)
+            if hit:
+                return value
+            with span("memory", operation) as s:
+                s.set_cache_hit(False)
+                value = loader()
+        if version is not None:
+            with self._lock:
+                self._put(key, version, value)
+        return value
+
+    def get_data(self, product_line: str):
+        """Retrieves the latest snapshot for a product line, if it exists."""
+        return self.get_latest(product_line)
+
+    def get_latest(self, product_line: str):
+        return self._read("get_latest", product_line, None,
+                          lambda: self.store.get_latest(product_line))
+
+    def get_as_of(self, product_line: str, when):
+        return self._read("get_as_of", product_line, str(when),
+                          lambda: self.store.get_as_of(product_line, when))
+
+    def get_history(self, product_line: str, n: int = 10):
+        return self._read("get_history", product_line, n,
+                          lambda: self.store.get_history(product_line, n))
+
+    def query_timeseries(self, product_line: str, start=None, end=None, freq=None):
+        return self._read("query_timeseries", product_line, (str(start), str(end), freq),
+                          lambda: self.store.query_timeseries(product_line, start, end, freq))
+
+    def store_data(self, product_line: str, data: dict):
+        """Writes through to the store and drops cached reads for the product line."""
+        self.store.store_data(product_line, data)
+        self.invalidate(product_line)
+
+    def invalidate(self, product_line: str = None):
+        """Drops cached entries for one product line, or everything."""
+        with self._lock:
+            if product_line is None:
+                keys = list(self._entries)
+            else:
+                keys = list(self._keys_by_product.get(self._key(product_line), ()))
+            for key in keys:
+                self._drop(key)
+            self.invalidations += len(keys)
+
+    def stats(self):
+        """Hit-rate and occupancy statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
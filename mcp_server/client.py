@@ -0,0 +1,185 @@
+"""
+Thin client for the out-of-process MCP server (see mcp_server/daemon.py).
+MCPClient mirrors the MCPServer API and RemoteMemoryStore mirrors the memory
+store API, so agents work unchanged whether the server is local or shared.
+"""
+
+import http.client
+import queue
+import threading
+from urllib.parse import urlparse
+
+from utils import serialization, tracing
+
+
+class MCPClientError(RuntimeError):
+    """Raised when the MCP daemon rejects a call or cannot be reached."""
+
+
+class ConnectionPool:
+    """Keeps idle keep-alive HTTP connections to the daemon for reuse."""
+
+    def __init__(self, host, port, max_idle=8, timeout=30.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=max_idle)
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def release(self, conn):
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class MCPClient:
+    """Proxy for a shared MCP daemon with the same methods as MCPServer."""
+
+    def __init__(self, url, pool_size=8, timeout=30.0):
+        parsed = urlparse(url)
+        self.url = url
+        self.pool = ConnectionPool(parsed.hostname or "127.0.0.1", parsed.port or 8765,
+                                   max_idle=pool_size, timeout=timeout)
+        self.memory_store = RemoteMemoryStore(self)
+        # Span latencies from this process are batched and forwarded to the daemon's histograms
+        self.flush_every = 32
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        tracing.add_span_listener(self._on_span)
+
+    def _on_span(self, record):
+        with self._pending_lock:
+            self._pending.append((record.get("kind"), record.get("name"), record.get("duration_ms") or 0.0))
+            ready = len(self._pending) >= self.flush_every
+        if ready:
+            self.flush_latencies()
+
+    def flush_latencies(self):
+        """Sends buffered span latencies to the daemon."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+        if pending:
+            try:
+                self.call("record_latencies", observations=pending)
+            except MCPClientError as e:
+                print(f"[MCPClient] -> Could not forward latencies: {e}")
+
+    def call(self, method, **params):
+        body = serialization.encode({"method": method, "params": params}, codec="json")
+        # A pooled connection may have been closed by the daemon while idle. Only that case is
+        # retried, on a fresh connection: the request never reached the daemon, so replaying it
+        # is safe. Timeouts and failures on a new connection are not retried.
+        for attempt in range(2):
+            conn = self.pool.acquire()
+            reused = conn.sock is not None
+            try:
+                try:
+                    conn.request("POST", "/rpc", body=body, headers={"Content-Type": "application/json"})
+                except (BrokenPipeError, ConnectionResetError):
+                    if reused and not attempt:
+                        conn.close()
+                        continue
+                    raise
+                try:
+                    response = conn.getresponse()
+                except http.client.RemoteDisconnected:
+                    if reused and not attempt:
+                        conn.close()
+                        continue
+                    raise
+                payload = serialization.decode(response.read())
+            except (http.client.HTTPException, ConnectionError, OSError) as e:
+                conn.close()
+                raise MCPClientError(f"MCP daemon at {self.url} unreachable: {e}") from e
+            self.pool.release(conn)
+            if response.status != 200:
+                raise MCPClientError(payload.get("error", f"HTTP {response.status}"))
+            return payload.get("result")
+
+    def get_memory_store(self):
+        return self.memory_store
+
+    def register_agent(self, agent_name: str, agent_type: str):
+        return self.call("register_agent", agent_name=agent_name, agent_type=agent_type)
+
+    def log_analysis(self, product_line: str, analysis_type: str, status: str):
+        return self.call("log_analysis", product_line=product_line, analysis_type=analysis_type, status=status)
+
+    def get_server_status(self):
+        self.flush_latencies()
+        return self.call("get_server_status")
+
+    def get_metrics_text(self):
+        self.flush_latencies()
+        return self.call("get_metrics_text")
+
+    def query_timeseries(self, product_line: str, start=None, end=None, freq=None):
+        return self.call("query_timeseries", product_line=product_line,
+                         start=None if start is None else str(start),
+                         end=None if end is None else str(end), freq=freq)
+
+    def compact_storage(self, policy=None, reports_dir=".", dry_run=False):
+        return self.call("compact_storage", policy=policy.to_dict() if policy else None,
+                         reports_dir=reports_dir, dry_run=dry_run)
+
+    def close(self):
+        self.pool.close()
+
+
+class RemoteMemoryStore:
+    """Memory store API backed by the daemon's (cached) store."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def get_data(self, product_line: str):
+        return self.client.call("memory.get_data", product_line=product_line)
+
+    def get_latest(self, product_line: str):
+        return self.client.call("memory.get_latest", product_line=product_line)
+
+    def get_as_of(self, product_line: str, when):
+        return self.client.call("memory.get_as_of", product_line=product_line, when=str(when))
+
+    def get_history(self, product_line: str, n: int = 10):
+        return self.client.call("memory.get_history", product_line=product_line, n=n)
+
+    def store_data(self, product_line: str, data: dict):
+        return self.client.call("memory.store_data", product_line=product_line, data=data)
+
+    def snapshot_count(self, product_line: str):
+        return self.client.call("memory.snapshot_count", product_line=product_line)
+
+    def query_timeseries(self, product_line: str, start=None, end=None, freq=None):
+        return self.client.call("memory.query_timeseries", product_line=product_line,
+                                start=None if start is None else str(start),
+                                end=None if end is None else str(end), freq=freq)
+
+    def version(self, product_line: str):
+        return self.client.call("memory.version", product_line=product_line)
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(url):
+    """Returns the process-wide client for a daemon URL."""
+    with _clients_lock:
+        client = _clients.get(url)
+        if client is None:
+            client = _clients[url] = MCPClient(url)
+        return client
@@ -0,0 +1,174 @@
+"""
+Retention, downsampling and compaction for MarketMate's on-disk data.
+
+Snapshots are thinned according to a RetentionPolicy (by default: every
+snapshot's day is kept for 30 days, then one per week for 26 weeks, then one
+per month), dated text reports older than the daily window are merged into
+monthly archives, and the job reports how many bytes were reclaimed.
+
+Run it offline (no analysis in progress) with:
+
+    python -m mcp_server.compaction [--dry-run] [--daily-days 30] ...
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+REPORT_PATTERN = re.compile(r"^market_report_(\d{4})-(\d{2})-(\d{2})\.txt$")
+
+
+class RetentionPolicy:
+    """How many days/weeks/months of snapshots to keep at each resolution."""
+
+    def __init__(self, daily_days=30, weekly_weeks=26, monthly_months=None):
+        self.daily_days = daily_days
+        self.weekly_weeks = weekly_weeks
+        # None keeps monthly snapshots forever
+        self.monthly_months = monthly_months
+
+    def to_dict(self):
+        return {
+            "daily_days": self.daily_days,
+            "weekly_weeks": self.weekly_weeks,
+            "monthly_months": self.monthly_months,
+        }
+
+
+def disk_usage(path):
+    """Bytes allocated on disk for a file (falls back to its size)."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return 0
+    blocks = getattr(stat, "st_blocks", None)
+    return blocks * 512 if blocks is not None else stat.st_size
+
+
+def select_snapshots_to_keep(timestamps, policy, now=None):
+    """
+    Returns the sorted positions of snapshots to retain. Within each day, ISO
+    week or month bucket the newest snapshot wins; the newest snapshot overall
+    is always kept.
+    """
+    now = now if now is not None else time.time()
+    weekly_limit = policy.daily_days + 7 * policy.weekly_weeks
+    monthly_limit = None if policy.monthly_months is None else weekly_limit + 31 * policy.monthly_months
+
+    latest_in_bucket = {}
+    for position, stored_at in enumerate(timestamps):
+        age_days = (now - stored_at) / 86400.0
+        day = datetime.fromtimestamp(stored_at).date()
+        if age_days <= policy.daily_days:
+            bucket = ("D", day.toordinal())
+        elif age_days <= weekly_limit:
+            year, week, _ = day.isocalendar()
+            bucket = ("W", year, week)
+        elif monthly_limit is None or age_days <= monthly_limit:
+            bucket = ("M", day.year, day.month)
+        else:
+            continue
+        latest_in_bucket[bucket] = position
+
+    keep = set(latest_in_bucket.values())
+    if timestamps:
+        keep.add(len(timestamps) - 1)
+    return sorted(keep)
+
+
+def merge_reports(reports_dir, archive_dir, policy, now=None, dry_run=False):
+    """Appends dated text reports older than the daily window to monthly archives."""
+    now = now if now is not None else time.time()
+    stats = {"files_merged": 0, "bytes_before": 0, "bytes_after": 0}
+    if not os.path.isdir(reports_dir):
+        return stats
+
+    by_month = {}
+    for name in sorted(os.listdir(reports_dir)):
+        match = REPORT_PATTERN.match(name)
+        if not match:
+            continue
+        year, month, day = (int(part) for part in match.groups())
+        report_time = datetime(year, month, day).timestamp()
+        if (now - report_time) / 86400.0 <= policy.daily_days:
+            continue
+        by_month.setdefault(f"{year:04d}-{month:02d}", []).append(name)
+
+    for month, names in by_month.items():
+        archive_path = os.path.join(archive_dir, f"market_reports_{month}.txt")
+        paths = [os.path.join(reports_dir, name) for name in names]
+        before = sum(disk_usage(p) for p in paths) + disk_usage(archive_path)
+        stats["bytes_before"] += before
+        stats["files_merged"] += len(paths)
+        if dry_run:
+            stats["bytes_after"] += before
+            continue
+        os.makedirs(archive_dir, exist_ok=True)
+        with open(archive_path, "a", encoding="utf-8") as archive:
+            for name, path in zip(names, paths):
+                with open(path, "r", encoding="utf-8") as report:
+                    archive.write(f"\n===== {name} =====\n")
+                    archive.write(report.read())
+        for path in paths:
+            os.remove(path)
+        stats["bytes_after"] += disk_usage(archive_path)
+    return stats
+
+
+def compact_storage(store, policy=None, reports_dir=".", archive_dir=None, now=None, dry_run=False):
+    """
+    Applies the retention policy to a memory store (file or SQLite, cached or
+    not) and merges old reports. Returns a summary including bytes reclaimed.
+    """
+    policy = policy or RetentionPolicy()
+    backend = getattr(store, "store", store)
+    archive_dir = archive_dir or os.path.join(reports_dir, "reports", "archive")
+
+    snapshot_stats = backend.compact(policy, now=now, dry_run=dry_run)
+    report_stats = merge_reports(reports_dir, archive_dir, policy, now=now, dry_run=dry_run)
+    if hasattr(store, "invalidate") and not dry_run:
+        store.invalidate()
+
+    bytes_before = snapshot_stats["bytes_before"] + report_stats["bytes_before"]
+    bytes_after = snapshot_stats["bytes_after"] + report_stats["bytes_after"]
+    return {
+        "policy": policy.to_dict(),
+        "dry_run": dry_run,
+        "snapshots": snapshot_stats,
+        "reports": report_stats,
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "bytes_reclaimed": bytes_before - bytes_after,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply retention and compaction to MarketMate data.")
+    parser.add_argument("--backend", default=None, help="Memory backend (file or sqlite); defaults to MCP_MEMORY_BACKEND")
+    parser.add_argument("--reports-dir", default=".", help="Directory holding market_report_YYYY-MM-DD.txt files")
+    parser.add_argument("--daily-days", type=int, default=30)
+    parser.add_argument("--weekly-weeks", type=int, default=26)
+    parser.add_argument("--monthly-months", type=int, default=0, help="0 keeps monthly snapshots forever")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be reclaimed without changing files")
+    args = parser.parse_args(argv)
+
+    from mcp_server.server import create_memory_store
+
+    policy = RetentionPolicy(args.daily_days, args.weekly_weeks, args.monthly_months or None)
+    summary = compact_storage(create_memory_store(args.backend), policy,
+                              reports_dir=args.reports_dir, dry_run=args.dry_run)
+
+    snapshots = summary["snapshots"]
+    print(f"[Compaction] -> Product lines: {snapshots['product_lines']}")
+    print(f"[Compaction] -> Snapshots: {snapshots['snapshots_before']} -> {snapshots['snapshots_after']}")
+    print(f"[Compaction] -> Files removed: {snapshots['files_removed']}, reports merged: {summary['reports']['files_merged']}")
+    print(f"[Compaction] -> Bytes: {summary['bytes_before']} -> {summary['bytes_after']} "
+          f"(reclaimed {summary['bytes_reclaimed']}){' [dry run]' if args.dry_run else ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""
+Low-contention synchronization helpers for the MCP server.
+"""
+
+import itertools
+import threading
+
+# Each thread is given the next shard number on first use (thread ids are page-aligned on
+# Linux, so taking them modulo the shard count would put every thread on the same shard)
+_next_shard = itertools.count()
+_thread_shard = threading.local()
+
+
+def _shard_index():
+    index = getattr(_thread_shard, "index", None)
+    if index is None:
+        index = _thread_shard.index = next(_next_shard)
+    return index
+
+
+class StripedLock:
+    """A fixed set of locks; each key maps to one stripe, so unrelated keys rarely contend."""
+
+    def __init__(self, stripes=32):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def for_key(self, key):
+        return self._locks[hash(key) % len(self._locks)]
+
+
+class ShardedCounter:
+    """Counter split across shards assigned round-robin to threads; increments rarely share a lock."""
+
+    def __init__(self, shards=16):
+        self._shards = [[0, threading.Lock()] for _ in range(shards)]
+
+    def increment(self, amount=1):
+        shard = self._shards[_shard_index() % len(self._shards)]
+        with shard[1]:
+            shard[0] += amount
+
+    def value(self):
+        return sum(shard[0] for shard in self._shards)
@@ -0,0 +1,117 @@
+"""
+Out-of-process MCP server.
+
+Runs one MCPServer (memory store, cache, analysis log, agent registry) behind
+a small HTTP/JSON endpoint so that every Streamlit worker and batch process
+shares the same state. Start it with:
+
+    python -m mcp_server.daemon --host 127.0.0.1 --port 8765
+
+and point workers at it with MCP_SERVER_URL=http://127.0.0.1:8765.
+"""
+
+import argparse
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mcp_server.server import MCPServer
+from utils import serialization
+
+# Methods callable over RPC: "<name>" on MCPServer, "memory.<name>" on its memory store
+SERVER_METHODS = ("register_agent", "log_analysis", "get_server_status",
+                  "query_timeseries", "compact_storage", "record_latencies", "get_metrics_text")
+MEMORY_METHODS = ("get_data", "get_latest", "get_as_of", "get_history", "store_data",
+                  "snapshot_count", "query_timeseries", "version")
+
+
+class MCPRequestHandler(BaseHTTPRequestHandler):
+    """Handles POST /rpc calls of the form {"method": ..., "params": {...}}."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "MarketMateMCP/1.0"
+
+    def log_message(self, format, *args):
+        # Requests are traced by the server itself; keep stderr quiet
+        pass
+
+    def _send(self, status, body):
+        payload = serialization.encode(body, codec="json")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok"})
+        elif self.path == "/metrics":
+            payload = self.server.mcp_server.get_metrics_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        else:
+            self._send(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/rpc":
+            self._send(404, {"error": f"Unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+            request = serialization.decode(self.rfile.read(length)) if length else {}
+            method = request.get("method", "")
+            params = request.get("params") or {}
+        except Exception as e:
+            self._send(400, {"error": f"Malformed request: {e}"})
+            return
+
+        mcp_server = self.server.mcp_server
+        if method.startswith("memory.") and method[len("memory."):] in MEMORY_METHODS:
+            target = getattr(mcp_server.get_memory_store(), method[len("memory."):])
+        elif method in SERVER_METHODS:
+            target = getattr(mcp_server, method)
+        else:
+            self._send(404, {"error": f"Unknown method '{method}'"})
+            return
+
+        try:
+            result = target(**params)
+        except Exception as e:
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        self._send(200, {"result": result})
+
+
+class MCPDaemon(ThreadingHTTPServer):
+    """Threaded HTTP server wrapping the process-local MCPServer."""
+
+    daemon_threads = True
+
+    def __init__(self, address, backend=None):
+        super().__init__(address, MCPRequestHandler)
+        self.mcp_server = MCPServer.local(backend)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the shared MarketMate MCP server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--backend", default=None, help="Memory backend (file or sqlite)")
+    args = parser.parse_args(argv)
+
+    daemon = MCPDaemon((args.host, args.port), backend=args.backend)
+    print(f"[MCPDaemon] -> Serving on http://{args.host}:{args.port}")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        print("[MCPDaemon] -> Shutting down")
+    finally:
+        daemon.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
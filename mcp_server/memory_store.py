@@ -1,38 +1,391 @@
-import json 
-import os 
-from datetime import date 
- 
-class MemoryStore: 
-    """ 
-    An MCP-style memory store for persistent agent data. 
-    Uses a simple file-based approach for demonstration. 
-    """ 
-    def __init__(self, data_dir="data"): 
-        self.data_dir = data_dir 
-        if not os.path.exists(self.data_dir): 
-            os.makedirs(self.data_dir) 
- 
-    def _get_filepath(self, product_line: str): 
-        """Generates a safe filename from the product line.""" 
-        import re
-        # Remove or replace invalid characters for filenames
-        safe_name = re.sub(r'[<>:"/\\|?*]', '_', product_line)
-        safe_name = safe_name.replace(" ", "_").lower()
-        # Limit length to avoid filesystem issues
-        if len(safe_name) > 100:
-            safe_name = safe_name[:100]
-        return os.path.join(self.data_dir, f"{safe_name}.json") 
- 
-    def store_data(self, product_line: str, data: dict): 
-        """Stores data related to a product line.""" 
-        filepath = self._get_filepath(product_line) 
-        with open(filepath, 'w') as f: 
-            json.dump(data, f, indent=4) 
-             
-    def get_data(self, product_line: str): 
-        """Retrieves data for a product line, if it exists.""" 
-        filepath = self._get_filepath(product_line) 
-        if os.path.exists(filepath): 
-            with open(filepath, 'r') as f: 
-                return json.load(f) 
-        return None
\ No newline at end of file
+import os
+import re
+import struct
+import threading
+import time
+from datetime import date, datetime, time as dt_time
+
+from mcp_server.compaction import disk_usage, select_snapshots_to_keep
+from mcp_server.product_keys import PRODUCT_ALIASES_FILE, ProductKeyIndex
+from mcp_server.timeseries import METRICS_RECORD, snapshot_metrics, to_columns
+from utils import serialization
+
+# Index record: stored-at timestamp, byte offset and length of the snapshot in the log
+INDEX_RECORD = struct.Struct("<dQI")
+# A legacy <name>.json snapshot has a 'date' and at least one of these fields (see agents/memory_agent.py)
+LEGACY_SNAPSHOT_FIELDS = ("competitors", "reviews", "trends")
+
+
+def to_timestamp(when, end_of_day=True):
+    """Converts a date, datetime, ISO string or epoch seconds into epoch seconds.
+    Plain dates (and 'YYYY-MM-DD' strings) mean the end of that day, or its
+    start when end_of_day is False."""
+    if isinstance(when, (int, float)):
+        return float(when)
+    if isinstance(when, str):
+        when = datetime.fromisoformat(when) if "T" in when or " " in when else date.fromisoformat(when)
+    if isinstance(when, datetime):
+        return when.timestamp()
+    if isinstance(when, date):
+        return datetime.combine(when, dt_time.max if end_of_day else dt_time.min).timestamp()
+    raise TypeError(f"Unsupported date value: {when!r}")
+
+
+def product_key(product_line: str):
+    """Generates a safe storage key from the product line.
+    This was the storage key before product lines were canonicalized; it is
+    still used to find data written under the old scheme."""
+    # Remove or replace invalid characters for filenames
+    safe_name = re.sub(r'[<>:"/\\|?*]', '_', product_line)
+    safe_name = safe_name.replace(" ", "_").lower()
+    # Limit length to avoid filesystem issues
+    if len(safe_name) > 100:
+        safe_name = safe_name[:100]
+    return safe_name
+
+
+class MemoryStore:
+    """
+    An MCP-style memory store for persistent agent data.
+    Every call to store_data appends a snapshot to a per-product-line log
+    (<name>.snapshots) and a fixed-width (timestamp, offset, length) record to
+    its index (<name>.idx), so earlier snapshots are never overwritten.
+    Latest reads are O(1) and "as of" reads are a binary search over the index.
+    A parallel <name>.ts file holds small per-snapshot metrics for time-series queries.
+    <name> is the canonical key of the product line, so spelling variants share one history.
+    """
+    def __init__(self, data_dir="data", codec=None, compression=None):
+        self.data_dir = data_dir
+        self.codec = codec
+        self.compression = compression
+        self._lock = threading.Lock()
+        if not os.path.exists(self.data_dir):
+            os.makedirs(self.data_dir)
+        self.keys = ProductKeyIndex(os.path.join(self.data_dir, PRODUCT_ALIASES_FILE))
+
+    def resolve_key(self, product_line: str):
+        """Canonical file stem for a product line (see mcp_server/product_keys.py)."""
+        legacy_key = product_key(product_line)
+        return self.keys.resolve(product_line, legacy_key, self._has_files)
+
+    def _has_files(self, key: str):
+        return any(os.path.exists(os.path.join(self.data_dir, f"{key}{ext}")) for ext in (".idx", ".json"))
+
+    def _get_filepath(self, key: str):
+        """Path of the legacy single-snapshot JSON file for a key."""
+        return os.path.join(self.data_dir, f"{key}.json")
+
+    def _get_log_paths(self, key: str):
+        """Returns (snapshot log path, index path) for a key."""
+        stem = os.path.join(self.data_dir, key)
+        return f"{stem}.snapshots", f"{stem}.idx"
+
+    def _get_metrics_path(self, key: str):
+        """Path of the fixed-width per-snapshot metrics file used by time-series queries."""
+        return os.path.join(self.data_dir, f"{key}.ts")
+
+    def _encode(self, data: dict):
+        return serialization.encode(data, codec=self.codec, compression=self.compression)
+
+    def _decode(self, payload: bytes):
+        return serialization.decode(payload)
+
+    def _count(self, index_path):
+        try:
+            return os.path.getsize(index_path) // INDEX_RECORD.size
+        except OSError:
+            return 0
+
+    def _read_index(self, index_file, position):
+        index_file.seek(position * INDEX_RECORD.size)
+        return INDEX_RECORD.unpack(index_file.read(INDEX_RECORD.size))
+
+    def _read_snapshot(self, log_path, offset, length):
+        with open(log_path, "rb") as f:
+            f.seek(offset)
+            return self._decode(f.read(length))
+
+    def _sync_metrics(self, key: str, count: int):
+        """Computes metrics rows for snapshots stored before the metrics file existed."""
+        metrics_path = self._get_metrics_path(key)
+        try:
+            done = os.path.getsize(metrics_path) // METRICS_RECORD.size
+        except OSError:
+            done = 0
+        if done >= count:
+            return
+        log_path, index_path = self._get_log_paths(key)
+        rows = []
+        with open(index_path, "rb") as index_file, open(log_path, "rb") as log_file:
+            previous = None
+            if done:
+                _, offset, length = self._read_index(index_file, done - 1)
+                log_file.seek(offset)
+                previous = self._decode(log_file.read(length))
+            for position in range(done, count):
+                stored_at, offset, length = self._read_index(index_file, position)
+                log_file.seek(offset)
+                current = self._decode(log_file.read(length))
+                rows.append(METRICS_RECORD.pack(*snapshot_metrics(previous, current, stored_at)))
+                previous = current
+        with open(metrics_path, "ab") as metrics_file:
+            metrics_file.truncate(done * METRICS_RECORD.size)
+            metrics_file.write(b"".join(rows))
+
+    def _append(self, key: str, data: dict, timestamp: float):
+        log_path, index_path = self._get_log_paths(key)
+        payload = self._encode(data)
+        count = self._count(index_path)
+        previous = None
+        if count:
+            # Keep the index sorted by time even if the clock steps backwards
+            with open(index_path, "rb") as index_file:
+                last_ts, last_offset, last_length = self._read_index(index_file, count - 1)
+            timestamp = max(timestamp, last_ts)
+            previous = self._read_snapshot(log_path, last_offset, last_length)
+            self._sync_metrics(key, count)
+        with open(log_path, "ab") as log_file:
+            offset = log_file.tell()
+            log_file.write(payload + b"\n")
+        with open(index_path, "ab") as index_file:
+            # Truncate any partially written record before appending
+            index_file.truncate(count * INDEX_RECORD.size)
+            index_file.write(INDEX_RECORD.pack(timestamp, offset, len(payload)))
+        with open(self._get_metrics_path(key), "ab") as metrics_file:
+            metrics_file.truncate(count * METRICS_RECORD.size)
+            metrics_file.write(METRICS_RECORD.pack(*snapshot_metrics(previous, data, timestamp)))
+
+    def _migrate_legacy(self, key: str):
+        """Imports a pre-existing <name>.json snapshot as the first log entry."""
+        legacy_path = self._get_filepath(key)
+        _, index_path = self._get_log_paths(key)
+        if os.path.exists(index_path) or not os.path.exists(legacy_path):
+            return
+        try:
+            legacy = self._load_legacy(legacy_path)
+            if legacy is None:
+                return
+            try:
+                timestamp = to_timestamp(legacy.get("date"))
+            except (TypeError, ValueError):
+                timestamp = os.path.getmtime(legacy_path)
+            self._append(key, legacy, timestamp)
+            print(f"[MemoryStore] -> Migrated legacy snapshot for '{key}'")
+        except Exception as e:
+            print(f"[MemoryStore] -> Could not migrate legacy snapshot for '{key}': {e}")
+
+    def _load_legacy(self, legacy_path: str):
+        """The snapshot in a legacy <name>.json file, or None if the file holds anything else."""
+        legacy = serialization.load_file(legacy_path)
+        if isinstance(legacy, dict) and "date" in legacy and any(f in legacy for f in LEGACY_SNAPSHOT_FIELDS):
+            return legacy
+        return None
+
+    def store_data(self, product_line: str, data: dict):
+        """Appends a new snapshot for a product line."""
+        key = self.resolve_key(product_line)
+        with self._lock:
+            self._migrate_legacy(key)
+            self._append(key, data, time.time())
+
+    def get_data(self, product_line: str):
+        """Retrieves the latest snapshot for a product line, if it exists."""
+        return self.get_latest(product_line)
+
+    def get_latest(self, product_line: str):
+        """Returns the most recent snapshot in O(1), or None."""
+        history = self.get_history(product_line, 1)
+        return history[0] if history else None
+
+    def get_as_of(self, product_line: str, when):
+        """Returns the latest snapshot stored at or before `when`, or None."""
+        key = self.resolve_key(product_line)
+        with self._lock:
+            self._migrate_legacy(key)
+        log_path, index_path = self._get_log_paths(key)
+        count = self._count(index_path)
+        if not count:
+            return None
+        target = to_timestamp(when)
+        with open(index_path, "rb") as index_file:
+            # Binary search for the last record with timestamp <= target
+            lo, hi = 0, count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._read_index(index_file, mid)[0] <= target:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo == 0:
+                return None
+            _, offset, length = self._read_index(index_file, lo - 1)
+        return self._read_snapshot(log_path, offset, length)
+
+    def get_history(self, product_line: str, n: int = 10):
+        """Returns the last n snapshots, oldest first."""
+        key = self.resolve_key(product_line)
+        with self._lock:
+            self._migrate_legacy(key)
+        log_path, index_path = self._get_log_paths(key)
+        count = self._count(index_path)
+        if not count or n <= 0:
+            return []
+        start = max(0, count - n)
+        with open(index_path, "rb") as index_file:
+            index_file.seek(start * INDEX_RECORD.size)
+            raw = index_file.read((count - start) * INDEX_RECORD.size)
+        records = [INDEX_RECORD.unpack_from(raw, i * INDEX_RECORD.size) for i in range(count - start)]
+        snapshots = []
+        with open(log_path, "rb") as log_file:
+            for _, offset, length in records:
+                log_file.seek(offset)
+                snapshots.append(self._decode(log_file.read(length)))
+        return snapshots
+
+    def query_timeseries(self, product_line: str, start=None, end=None, freq=None):
+        """
+        Columnar sentiment, competitor-churn and trend-overlap series between
+        start and end (inclusive dates/datetimes; None means unbounded).
+        Reads only the per-snapshot metrics rows in range, located by binary search.
+        """
+        key = self.resolve_key(product_line)
+        with self._lock:
+            self._migrate_legacy(key)
+            count = self._count(self._get_log_paths(key)[1])
+            if count:
+                self._sync_metrics(key, count)
+        if not count:
+            return to_columns([], freq)
+
+        metrics_path = self._get_metrics_path(key)
+        size = METRICS_RECORD.size
+        with open(metrics_path, "rb") as metrics_file:
+            def stored_at(position):
+                metrics_file.seek(position * size)
+                return METRICS_RECORD.unpack(metrics_file.read(size))[0]
+
+            def first_after(target, inclusive):
+                lo, hi = 0, count
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    value = stored_at(mid)
+                    if value < target or (not inclusive and value == target):
+                        lo = mid + 1
+                    else:
+                        hi = mid
+                return lo
+
+            lo = first_after(to_timestamp(start, end_of_day=False), True) if start is not None else 0
+            hi = first_after(to_timestamp(end), False) if end is not None else count
+            if hi <= lo:
+                return to_columns([], freq)
+            metrics_file.seek(lo * size)
+            raw = metrics_file.read((hi - lo) * size)
+        rows = [METRICS_RECORD.unpack_from(raw, i * size) for i in range(hi - lo)]
+        return to_columns(rows, freq)
+
+    def _compact_product(self, stem: str, policy, now, dry_run, stats):
+        log_path, index_path = self._get_log_paths(stem)
+        metrics_path = self._get_metrics_path(stem)
+        paths = (log_path, index_path, metrics_path)
+        count = self._count(index_path)
+        with open(index_path, "rb") as index_file:
+            raw = index_file.read(count * INDEX_RECORD.size)
+        records = [INDEX_RECORD.unpack_from(raw, i * INDEX_RECORD.size) for i in range(count)]
+        keep = select_snapshots_to_keep([r[0] for r in records], policy, now)
+
+        before = sum(disk_usage(p) for p in paths)
+        stats["product_lines"] += 1
+        stats["snapshots_before"] += count
+        stats["snapshots_after"] += len(keep)
+        stats["bytes_before"] += before
+        live_bytes = sum(length + 1 for _, _, length in records)
+        if len(keep) == count and os.path.getsize(log_path) == live_bytes:
+            stats["bytes_after"] += before
+            return
+        if dry_run:
+            stats["bytes_after"] += (sum(records[p][2] + 1 for p in keep) +
+                                     len(keep) * (INDEX_RECORD.size + METRICS_RECORD.size))
+            return
+
+        # Rewrite the log, index and metrics for the retained snapshots, then swap them in
+        tmp_paths = [f"{p}.compact" for p in paths]
+        previous = None
+        with open(log_path, "rb") as log_file, open(tmp_paths[0], "wb") as new_log, \
+                open(tmp_paths[1], "wb") as new_index, open(tmp_paths[2], "wb") as new_metrics:
+            for position in keep:
+                stored_at, offset, length = records[position]
+                log_file.seek(offset)
+                payload = log_file.read(length)
+                new_index.write(INDEX_RECORD.pack(stored_at, new_log.tell(), length))
+                new_log.write(payload + b"\n")
+                current = self._decode(payload)
+                new_metrics.write(METRICS_RECORD.pack(*snapshot_metrics(previous, current, stored_at)))
+                previous = current
+        for tmp_path, path in zip(tmp_paths, paths):
+            os.replace(tmp_path, path)
+        stats["bytes_after"] += sum(disk_usage(p) for p in paths)
+
+    def _is_legacy_snapshot(self, legacy_path: str):
+        try:
+            return self._load_legacy(legacy_path) is not None
+        except Exception:
+            return False
+
+    def compact(self, policy, now=None, dry_run=False):
+        """
+        Downsamples every product line's history according to a RetentionPolicy,
+        migrates and removes legacy <name>.json snapshots (files with the legacy snapshot
+        shape only), and reports bytes reclaimed.
+        Should run while no other process is writing to the data directory.
+        """
+        stats = {"product_lines": 0, "snapshots_before": 0, "snapshots_after": 0,
+                 "files_removed": 0, "bytes_before": 0, "bytes_after": 0}
+        with self._lock:
+            names = sorted(os.listdir(self.data_dir))
+            for name in names:
+                if (not name.endswith(".json") or name.startswith("_")
+                        or name.endswith("_visualization_data.json")):
+                    continue
+                stem = name[:-len(".json")]
+                legacy_path = os.path.join(self.data_dir, name)
+                if not self._is_legacy_snapshot(legacy_path):
+                    # Other JSON files in the data directory are left alone
+                    continue
+                size = disk_usage(legacy_path)
+                if not dry_run:
+                    self._migrate_legacy(stem)
+                # Removed once its snapshot is in the log; a dry run counts it as migrated
+                if dry_run or os.path.exists(self._get_log_paths(stem)[1]):
+                    stats["files_removed"] += 1
+                    stats["bytes_before"] += size
+                    if not dry_run:
+                        os.remove(legacy_path)
+
+            for name in sorted(os.listdir(self.data_dir)):
+                if name.endswith(".idx"):
+                    self._compact_product(name[:-len(".idx")], policy, now, dry_run, stats)
+        return stats
+
+    def version(self, product_line: str):
+        """Cheap change token for a product line: (mtime_ns, size) of its index."""
+        return self.key_version(self.resolve_key(product_line))
+
+    def key_version(self, key: str):
+        """version() for an already resolved key."""
+        try:
+            stat = os.stat(self._get_log_paths(key)[1])
+        except OSError:
+            legacy_path = self._get_filepath(key)
+            if not os.path.exists(legacy_path):
+                return None
+            stat = os.stat(legacy_path)
+            return ("legacy", stat.st_mtime_ns, stat.st_size)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def snapshot_count(self, product_line: str):
+        """Number of snapshots stored for a product line."""
+        key = self.resolve_key(product_line)
+        with self._lock:
+            self._migrate_legacy(key)
+        return self._count(self._get_log_paths(key)[1])
@@ -0,0 +1,120 @@
+"""
+Streaming latency histograms for the MCP server.
+
+Finished trace spans (see utils/tracing.py) are recorded into fixed-bucket
+histograms keyed by (kind, name): graph nodes, search endpoints, LLM prompt
+types, model inference and memory reads. Each observation is O(1); the
+histograms are exposed through get_server_status and as Prometheus text.
+"""
+
+import bisect
+import threading
+
+# Upper bucket bounds in milliseconds; the last bucket is +Inf
+BUCKET_BOUNDS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with count, sum, min and max."""
+
+    def __init__(self, bounds=BUCKET_BOUNDS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = None
+        self._lock = threading.Lock()
+
+    def observe(self, duration_ms):
+        index = bisect.bisect_left(self.bounds, duration_ms)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total_ms += duration_ms
+            self.min_ms = duration_ms if self.min_ms is None else min(self.min_ms, duration_ms)
+            self.max_ms = duration_ms if self.max_ms is None else max(self.max_ms, duration_ms)
+
+    def _quantile(self, counts, count, q):
+        """Estimates a quantile by linear interpolation inside the matching bucket."""
+        if not count:
+            return None
+        target = q * count
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            if bucket_count and seen + bucket_count >= target:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else (self.max_ms or lower)
+                fraction = (target - seen) / bucket_count
+                return round(min(lower + (upper - lower) * fraction, self.max_ms), 3)
+            seen += bucket_count
+        return self.max_ms
+
+    def snapshot(self):
+        with self._lock:
+            counts = list(self.counts)
+            count, total, low, high = self.count, self.total_ms, self.min_ms, self.max_ms
+        return {
+            "count": count,
+            "mean_ms": round(total / count, 3) if count else None,
+            "min_ms": None if low is None else round(low, 3),
+            "max_ms": None if high is None else round(high, 3),
+            "p50_ms": self._quantile(counts, count, 0.50),
+            "p95_ms": self._quantile(counts, count, 0.95),
+            "p99_ms": self._quantile(counts, count, 0.99),
+            "bucket_counts": counts,
+            "sum_ms": round(total, 3),
+        }
+
+
+class MetricsRegistry:
+    """Histograms keyed by (kind, name), fed from trace spans."""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def _histogram(self, kind, name):
+        key = (kind, name)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def observe(self, kind, name, duration_ms):
+        self._histogram(kind, name).observe(float(duration_ms))
+
+    def on_span(self, record):
+        """Span listener for utils.tracing.add_span_listener."""
+        self.observe(record.get("kind", "unknown"), record.get("name", "unknown"),
+                     record.get("duration_ms") or 0.0)
+
+    def snapshot(self):
+        """Nested {kind: {name: summary}} view for get_server_status."""
+        result = {"bucket_bounds_ms": list(BUCKET_BOUNDS_MS)}
+        for (kind, name), histogram in sorted(list(self._histograms.items())):
+            result.setdefault(kind, {})[name] = histogram.snapshot()
+        return result
+
+    def to_prometheus(self, metric="marketmate_operation_duration_seconds"):
+        """Prometheus text exposition of every histogram (bounds in seconds)."""
+        lines = [
+            f"# HELP {metric} Duration of MarketMate operations (nodes, searches, LLM calls, models).",
+            f"# TYPE {metric} histogram",
+        ]
+        for (kind, name), histogram in sorted(list(self._histograms.items())):
+            stats = histogram.snapshot()
+            labels = f'kind="{_escape(kind)}",name="{_escape(name)}"'
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKET_BOUNDS_MS, stats["bucket_counts"]):
+                cumulative += bucket_count
+                lines.append(f'{metric}_bucket{{{labels},le="{bound / 1000.0:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {stats["count"]}')
+            lines.append(f"{metric}_sum{{{labels}}} {stats['sum_ms'] / 1000.0:.6f}")
+            lines.append(f"{metric}_count{{{labels}}} {stats['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,183 @@
+"""
+Canonical storage keys for product lines.
+
+"Motorcycle Brake Pads", "motorcycle brake-pads" and an LLM-refined
+"Motorcycle Brake Pads (Aftermarket)" should all find the same history.
+Product lines are normalized (case, punctuation, accents, simple plurals,
+stop words, token order), and an alias index maps every normalized form
+seen so far to one canonical key. Unseen forms can optionally be matched
+to an existing key by fuzzy similarity above a threshold
+(MCP_FUZZY_PRODUCT_KEYS=1), but never across model numbers or variants.
+"""
+
+import difflib
+import os
+import re
+import threading
+import unicodedata
+
+from utils import serialization
+
+STOP_WORDS = {"a", "an", "and", "the", "for", "of", "in", "on", "with", "to", "by", "&"}
+# Words ending in -s that are not plurals, or whose singular names something else
+INVARIANT_WORDS = {"news", "series", "species", "lens", "means", "glasses", "goods", "pants", "jeans",
+                   "shorts", "clothes", "scissors", "electronics", "physics", "gps", "sms", "plus", "canvas",
+                   "chassis", "atlas", "status", "bias", "always", "sales"}
+# Variant words that tell models apart as much as a model number does
+VARIANT_WORDS = {"pro", "max", "mini", "plus", "ultra", "lite", "air", "se", "xl"}
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+MAX_KEY_LENGTH = 100
+# Alias index file kept next to the snapshots of a store
+PRODUCT_ALIASES_FILE = "_product_aliases.json"
+# Matching unseen forms by similarity can merge different products, so it is opt-in
+FUZZY_PRODUCT_KEYS = os.getenv("MCP_FUZZY_PRODUCT_KEYS", "0") in ("1", "true", "True")
+FUZZY_THRESHOLD = 0.85
+
+
+def _singular(token):
+    """Strips regular English plural suffixes only; anything irregular is left alone."""
+    if len(token) <= 3 or not token.isalpha() or token in INVARIANT_WORDS:
+        return token
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if token.endswith(("ches", "shes", "sses", "xes", "zes")):
+        return token[:-2]
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def model_tokens(key: str):
+    """Tokens that identify a model: anything containing a digit, plus variant words like 'pro'."""
+    return {t for t in key.split("_") if t in VARIANT_WORDS or any(c.isdigit() for c in t)}
+
+
+def normalize_product_line(product_line: str):
+    """Order-insensitive normalized form, e.g. 'Motorcycle Brake-Pads' -> 'brake_motorcycle_pad'."""
+    text = unicodedata.normalize("NFKD", product_line or "")
+    text = text.encode("ascii", "ignore").decode("ascii").lower()
+    tokens = {_singular(t) for t in _NON_ALNUM.split(text) if t and t not in STOP_WORDS}
+    key = "_".join(sorted(tokens)) or "unnamed"
+    return key[:MAX_KEY_LENGTH]
+
+
+def similarity(key_a: str, key_b: str):
+    """
+    Blend of token Jaccard and containment, or character similarity for typos.
+    Keys naming different models ('iphone_14_case' vs 'iphone_15_case') score 0.
+    """
+    if model_tokens(key_a) != model_tokens(key_b):
+        return 0.0
+    tokens_a, tokens_b = set(key_a.split("_")), set(key_b.split("_"))
+    shared = len(tokens_a & tokens_b)
+    token_score = 0.0
+    if shared:
+        jaccard = shared / len(tokens_a | tokens_b)
+        smaller = min(len(tokens_a), len(tokens_b))
+        # Containment only counts when the shorter name is more than one word
+        containment = shared / smaller if smaller > 1 else jaccard
+        token_score = 0.5 * jaccard + 0.5 * containment
+    return max(token_score, difflib.SequenceMatcher(None, key_a, key_b).ratio())
+
+
+class ProductKeyIndex:
+    """
+    Persistent alias index (normalized form -> canonical key) shared by a store.
+    The file is re-read when another process has changed it.
+    """
+
+    def __init__(self, path, fuzzy=FUZZY_PRODUCT_KEYS, threshold=FUZZY_THRESHOLD):
+        self.path = path
+        self.fuzzy = fuzzy
+        self.threshold = threshold
+        self.aliases = {}
+        self._forms_by_token = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+        self.stats = {"lookups": 0, "alias_hits": 0, "fuzzy_matches": 0, "new_keys": 0}
+        self._reload()
+
+    def _reload(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            data = serialization.load_file(self.path)
+        except Exception as e:
+            print(f"[ProductKeyIndex] -> Could not read alias index: {e}")
+            return
+        self.aliases = dict(data.get("aliases", {}))
+        self._forms_by_token = {}
+        for form in self.aliases:
+            self._index_form(form)
+        self._mtime = mtime
+
+    def _index_form(self, form):
+        for token in form.split("_"):
+            self._forms_by_token.setdefault(token, set()).add(form)
+
+    def _save(self):
+        try:
+            serialization.dump_file({"aliases": self.aliases}, self.path, codec="json")
+            self._mtime = os.stat(self.path).st_mtime_ns
+        except Exception as e:
+            print(f"[ProductKeyIndex] -> Could not save alias index: {e}")
+
+    def _best_match(self, normalized):
+        """Canonical key of the most similar known form, if it clears the threshold."""
+        # Only forms sharing a token are compared, so lookups stay cheap as the index grows
+        candidates = set()
+        for token in normalized.split("_"):
+            candidates |= self._forms_by_token.get(token, set())
+        best_form, best_score = None, 0.0
+        for form in candidates:
+            score = similarity(normalized, form)
+            if score > best_score:
+                best_form, best_score = form, score
+        if best_form is None:
+            # No shared token at all (e.g. a single misspelt word): fall back to character similarity
+            matches = difflib.get_close_matches(normalized, list(self.aliases), n=5, cutoff=self.threshold)
+            matches = [form for form in matches if model_tokens(form) == model_tokens(normalized)]
+            best_form, best_score = (matches[0], self.threshold) if matches else (None, 0.0)
+        return self.aliases[best_form] if best_score >= self.threshold else None
+
+    def resolve(self, product_line: str, legacy_key: str = None, legacy_exists=None):
+        """
+        Canonical key for a product line. New groups reuse `legacy_key` when
+        `legacy_exists(legacy_key)` reports data stored under the old scheme.
+        """
+        normalized = normalize_product_line(product_line)
+        with self._lock:
+            self.stats["lookups"] += 1
+            key = self.aliases.get(normalized)
+            if key is None:
+                self._reload()
+                key = self.aliases.get(normalized)
+            if key is not None:
+                self.stats["alias_hits"] += 1
+                return key
+
+            key = self._best_match(normalized) if self.fuzzy and self.aliases else None
+            if key is not None:
+                self.stats["fuzzy_matches"] += 1
+            else:
+                key = normalized
+                if legacy_key and legacy_key != normalized and legacy_exists and legacy_exists(legacy_key):
+                    key = legacy_key
+                self.stats["new_keys"] += 1
+            self.aliases[normalized] = key
+            self._index_form(normalized)
+            self._save()
+            return key
+
+    def aliases_for(self, key: str):
+        """All normalized forms that resolve to a canonical key."""
+        with self._lock:
+            return sorted(form for form, target in self.aliases.items() if target == key)
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats, keys=len(set(self.aliases.values())), aliases=len(self.aliases))
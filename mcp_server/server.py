@@ -5,9 +5,44 @@ API or service for managing memory state.
 For this project, it acts as a centralized access point for the MemoryStore.
 """
 
+import os
+import threading
 from mcp_server.memory_store import MemoryStore
+from mcp_server.analysis_log import AnalysisLog
+from mcp_server.cache import CachedMemoryStore
+from mcp_server.concurrency import StripedLock
+from mcp_server.metrics import MetricsRegistry
+from utils import tracing
 from datetime import datetime
 
+# Memory backend: "file" (per-product-line snapshot logs) or "sqlite" (WAL database)
+MEMORY_BACKEND = os.getenv("MCP_MEMORY_BACKEND", "file")
+SQLITE_PATH = os.getenv("MCP_SQLITE_PATH", os.path.join("data", "memory.db"))
+# Read-through cache in front of the store; set MCP_MEMORY_CACHE=0 to disable
+MEMORY_CACHE_ENABLED = os.getenv("MCP_MEMORY_CACHE", "1") not in ("0", "false", "False")
+MEMORY_CACHE_MAX_BYTES = int(os.getenv("MCP_MEMORY_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+# One cache read in this many is traced even when it hits (misses are always traced)
+MEMORY_CACHE_HIT_SPAN_EVERY = int(os.getenv("MCP_MEMORY_CACHE_HIT_SPAN_EVERY", "64"))
+# When set (e.g. http://127.0.0.1:8765), MCPServer() returns a client for the shared daemon
+SERVER_URL = os.getenv("MCP_SERVER_URL", "")
+
+
+def create_memory_store(backend: str = None):
+    """Builds the memory store for the requested backend."""
+    backend = (backend or MEMORY_BACKEND).lower()
+    if backend == "sqlite":
+        from mcp_server.sqlite_store import SQLiteMemoryStore
+        store = SQLiteMemoryStore(SQLITE_PATH)
+    elif backend == "file":
+        store = MemoryStore()
+    else:
+        raise ValueError(f"Unknown memory backend '{backend}'. Use 'file' or 'sqlite'.")
+    if MEMORY_CACHE_ENABLED:
+        store = CachedMemoryStore(store, max_bytes=MEMORY_CACHE_MAX_BYTES,
+                                  hit_span_every=MEMORY_CACHE_HIT_SPAN_EVERY)
+    return store
+
+
 class MCPServer:
     """
     A lightweight, class-based server to manage the MemoryStore.
@@ -15,29 +50,65 @@ class MCPServer:
     This acts as the central coordinator for all agent interactions.
     """
     _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls, backend: str = None):
+        """Singleton pattern to ensure only one instance of the server exists.
+        `backend` (or MCP_MEMORY_BACKEND) only applies when the server is first created.
+        With MCP_SERVER_URL set, returns an MCPClient for the shared daemon instead."""
+        if SERVER_URL:
+            from mcp_server.client import get_client
+            return get_client(SERVER_URL)
+        return cls.local(backend)
 
-    def __new__(cls):
-        """Singleton pattern to ensure only one instance of the server exists."""
+    @classmethod
+    def local(cls, backend: str = None):
+        """Returns the in-process server, ignoring MCP_SERVER_URL (used by the daemon)."""
+        # Double-checked locking: only the first construction takes the lock, and the
+        # instance is published after it is fully initialized
         if cls._instance is None:
-            cls._instance = super(MCPServer, cls).__new__(cls)
-            cls._instance.memory_store = MemoryStore()
-            cls._instance.agent_connections = {}
-            cls._instance.analysis_history = []
-            print("[MCPServer] -> Server initialized (Singleton)")
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(MCPServer, cls).__new__(cls)
+                    instance.memory_store = create_memory_store(backend)
+                    instance.agent_connections = {}
+                    instance._agent_locks = StripedLock()
+                    instance.analysis_log = AnalysisLog()
+                    instance.metrics = MetricsRegistry()
+                    tracing.add_span_listener(instance.metrics.on_span)
+                    cls._instance = instance
+                    print("[MCPServer] -> Server initialized (Singleton)")
         return cls._instance
 
     def get_memory_store(self):
         """Returns the single instance of the MemoryStore."""
         return self.memory_store
 
+    @property
+    def analysis_history(self):
+        """Recent analysis entries held in memory (bounded ring buffer)."""
+        return self.analysis_log.recent(self.analysis_log.recent_entries.maxlen)
+
     def register_agent(self, agent_name: str, agent_type: str):
-        """Register an agent with the MCP server."""
-        self.agent_connections[agent_name] = {
-            "type": agent_type,
-            "connected_at": datetime.now().isoformat(),
-            "status": "active"
-        }
-        print(f"[MCPServer] -> Agent '{agent_name}' ({agent_type}) registered")
+        """Register an agent with the MCP server, or refresh an existing registration."""
+        now = datetime.now().isoformat()
+        with self._agent_locks.for_key(agent_name):
+            connection = self.agent_connections.get(agent_name)
+            if connection is None:
+                self.agent_connections[agent_name] = {
+                    "type": agent_type,
+                    "connected_at": now,
+                    "last_seen": now,
+                    "registrations": 1,
+                    "status": "active"
+                }
+            else:
+                connection["type"] = agent_type
+                connection["last_seen"] = now
+                connection["registrations"] += 1
+                connection["status"] = "active"
+        if connection is None:
+            print(f"[MCPServer] -> Agent '{agent_name}' ({agent_type}) registered")
 
     def log_analysis(self, product_line: str, analysis_type: str, status: str):
         """Log analysis activities for monitoring."""
@@ -47,21 +118,138 @@ class MCPServer:
             "analysis_type": analysis_type,
             "status": status
         }
-        self.analysis_history.append(log_entry)
+        self.analysis_log.append(log_entry)
         print(f"[MCPServer] -> Analysis logged: {product_line} - {analysis_type} - {status}")
 
+    def query_timeseries(self, product_line: str, start=None, end=None, freq=None):
+        """Columnar history of sentiment, competitor churn and trend overlap for a product line."""
+        return self.memory_store.query_timeseries(product_line, start=start, end=end, freq=freq)
+
+    def compact_storage(self, policy=None, reports_dir=".", dry_run=False):
+        """
+        Applies the retention policy to stored snapshots and archives old reports.
+        policy may also be a RetentionPolicy.to_dict() result, as sent by MCPClient.
+        """
+        from mcp_server.compaction import RetentionPolicy, compact_storage
+        if isinstance(policy, dict):
+            policy = RetentionPolicy(**policy)
+        return compact_storage(self.memory_store, policy, reports_dir=reports_dir, dry_run=dry_run)
+
+    def record_latencies(self, observations):
+        """Records (kind, name, duration_ms) observations forwarded by remote clients."""
+        for kind, name, duration_ms in observations:
+            self.metrics.observe(kind, name, duration_ms)
+
+    def get_metrics_text(self):
+        """Latency histograms in Prometheus text exposition format."""
+        return self.metrics.to_prometheus()
+
+    def _agent_snapshot(self):
+        """Consistent copy of the agent registry (records are copied under their stripe lock)."""
+        snapshot = {}
+        for agent_name, connection in list(self.agent_connections.items()):
+            with self._agent_locks.for_key(agent_name):
+                snapshot[agent_name] = dict(connection)
+        return snapshot
+
     def get_server_status(self):
         """Get current server status and statistics."""
+        agent_connections = self._agent_snapshot()
         return {
-            "connected_agents": len(self.agent_connections),
-            "total_analyses": len(self.analysis_history),
+            "connected_agents": len(agent_connections),
+            "analyses_since_start": self.analysis_log.total,
             "memory_store_active": self.memory_store is not None,
-            "agent_connections": self.agent_connections,
-            "recent_analyses": self.analysis_history[-5:] if self.analysis_history else []
+            "memory_backend": type(getattr(self.memory_store, "store", self.memory_store)).__name__,
+            "memory_cache": self.memory_store.stats() if isinstance(self.memory_store, CachedMemoryStore) else None,
+            "product_keys": self.memory_store.keys.get_stats() if hasattr(self.memory_store, "keys") else None,
+            "agent_connections": agent_connections,
+            "analysis_stats": self.analysis_log.aggregates(),
+            "latency_histograms": self.metrics.snapshot(),
+            "stats_since": self.analysis_log.started_at,
+            "recent_analyses": self.analysis_log.recent(5)
         }
 
+def _stress_test(threads=32, iterations=500):
+    """
+    Hammers singleton creation, agent registration, analysis logging and status
+    reads from many threads, then checks that no update was lost.
+    Runs in a temporary directory so real data is untouched.
+    """
+    import contextlib
+    import io
+    import tempfile
+
+    errors = []
+    original_dir, original_instance = os.getcwd(), MCPServer._instance
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        MCPServer._instance = None
+        try:
+            barrier = threading.Barrier(threads)
+            instances = []
+            stop = threading.Event()
+
+            def worker(thread_id):
+                try:
+                    barrier.wait()
+                    server = MCPServer.local()
+                    instances.append(server)
+                    for i in range(iterations):
+                        server.register_agent(f"agent_{i % 8}", "stress")
+                        server.log_analysis(f"product_{thread_id % 4}", f"type_{i % 5}", "started")
+                        server.log_analysis(f"product_{thread_id % 4}", f"type_{i % 5}", "completed")
+                except Exception as e:
+                    errors.append(e)
+
+            def reader():
+                while not stop.is_set():
+                    try:
+                        MCPServer.local().get_server_status()
+                    except Exception as e:
+                        errors.append(e)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+                status_reader = threading.Thread(target=reader)
+                status_reader.start()
+                for t in workers:
+                    t.start()
+                for t in workers:
+                    t.join()
+                stop.set()
+                status_reader.join()
+
+            server = MCPServer.local()
+            status = server.get_server_status()
+            expected_logs = threads * iterations * 2
+            registrations = sum(c["registrations"] for c in status["agent_connections"].values())
+            logged = sum(s["count"] for s in status["analysis_stats"].values())
+            checks = {
+                "single instance": len({id(i) for i in instances}) == 1,
+                "no errors": not errors,
+                "analyses since start": status["analyses_since_start"] == expected_logs,
+                "aggregated analyses": logged == expected_logs,
+                "agent registrations": registrations == threads * iterations,
+            }
+        finally:
+            if MCPServer._instance is not None:
+                tracing.remove_span_listener(MCPServer._instance.metrics.on_span)
+            MCPServer._instance = original_instance
+            os.chdir(original_dir)
+
+    for name, passed in checks.items():
+        print(f"[MCPServer] -> Stress check '{name}': {'ok' if passed else 'FAILED'}")
+    for e in errors[:5]:
+        print(f"[MCPServer] -> Error during stress test: {e!r}")
+    return all(checks.values())
+
+
 # Example usage (not used in main.py, but shows the design pattern)
 if __name__ == "__main__":
+    import sys
+    if "--stress" in sys.argv:
+        sys.exit(0 if _stress_test() else 1)
+
     # Agent 1 connects to the server
     server1 = MCPServer()
     memory_store1 = server1.get_memory_store()
@@ -0,0 +1,233 @@
+"""
+SQLite-backed implementation of the MemoryStore interface.
+The database runs in WAL mode so that any number of readers (Streamlit
+sessions, batch workers) can query snapshots while another process writes.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from mcp_server.compaction import disk_usage, select_snapshots_to_keep
+from mcp_server.memory_store import product_key, to_timestamp
+from mcp_server.product_keys import PRODUCT_ALIASES_FILE, ProductKeyIndex
+from mcp_server.timeseries import snapshot_metrics, to_columns
+from utils import serialization
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS snapshots (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        product_key TEXT NOT NULL,
+        product_line TEXT NOT NULL,
+        snapshot_date TEXT,
+        stored_at REAL NOT NULL,
+        payload BLOB NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_snapshots_product_stored ON snapshots (product_key, stored_at)",
+    "CREATE INDEX IF NOT EXISTS idx_snapshots_product_date ON snapshots (product_key, snapshot_date)",
+    """
+    CREATE TABLE IF NOT EXISTS snapshot_metrics (
+        snapshot_id INTEGER PRIMARY KEY REFERENCES snapshots (id),
+        product_key TEXT NOT NULL,
+        stored_at REAL NOT NULL,
+        sentiment INTEGER NOT NULL,
+        competitor_count INTEGER NOT NULL,
+        competitors_added INTEGER NOT NULL,
+        competitors_removed INTEGER NOT NULL,
+        trend_count INTEGER NOT NULL,
+        trend_overlap REAL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_metrics_product_stored ON snapshot_metrics (product_key, stored_at)",
+)
+
+# Statements are kept as constants so sqlite3's statement cache reuses the prepared form
+_INSERT = ("INSERT INTO snapshots (product_key, product_line, snapshot_date, stored_at, payload) "
+           "VALUES (?, ?, ?, ?, ?)")
+_SELECT_LATEST = ("SELECT payload FROM snapshots WHERE product_key = ? "
+                  "ORDER BY stored_at DESC, id DESC LIMIT 1")
+_SELECT_AS_OF = ("SELECT payload FROM snapshots WHERE product_key = ? AND stored_at <= ? "
+                 "ORDER BY stored_at DESC, id DESC LIMIT 1")
+_SELECT_LAST_N = ("SELECT payload FROM snapshots WHERE product_key = ? "
+                  "ORDER BY stored_at DESC, id DESC LIMIT ?")
+_COUNT = "SELECT COUNT(*) FROM snapshots WHERE product_key = ?"
+_VERSION = "SELECT MAX(id) FROM snapshots WHERE product_key = ?"
+_INSERT_METRICS = ("INSERT OR REPLACE INTO snapshot_metrics (snapshot_id, product_key, stored_at, sentiment, "
+                   "competitor_count, competitors_added, competitors_removed, trend_count, trend_overlap) "
+                   "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+_SELECT_METRICS = ("SELECT stored_at, sentiment, competitor_count, competitors_added, competitors_removed, "
+                   "trend_count, trend_overlap FROM snapshot_metrics "
+                   "WHERE product_key = ? AND stored_at >= ? AND stored_at <= ? ORDER BY stored_at, snapshot_id")
+_SELECT_UNINDEXED = ("SELECT s.id, s.stored_at, s.payload FROM snapshots s "
+                     "LEFT JOIN snapshot_metrics m ON m.snapshot_id = s.id "
+                     "WHERE s.product_key = ? AND m.snapshot_id IS NULL ORDER BY s.stored_at, s.id")
+_SELECT_KEYS = "SELECT DISTINCT product_key FROM snapshots"
+_SELECT_TIMELINE = "SELECT id, stored_at, LENGTH(payload) FROM snapshots WHERE product_key = ? ORDER BY stored_at, id"
+_DELETE_SNAPSHOT = "DELETE FROM snapshots WHERE id = ?"
+_DELETE_METRICS = "DELETE FROM snapshot_metrics WHERE product_key = ?"
+_SELECT_PREVIOUS = ("SELECT payload FROM snapshots WHERE product_key = ? AND (stored_at < ? OR "
+                    "(stored_at = ? AND id < ?)) ORDER BY stored_at DESC, id DESC LIMIT 1")
+
+
+class SQLiteMemoryStore:
+    """
+    Drop-in replacement for MemoryStore that keeps every snapshot in a single
+    SQLite database. Each thread gets its own connection.
+    """
+    def __init__(self, db_path=os.path.join("data", "memory.db"), codec=None, compression=None):
+        self.db_path = db_path
+        self.codec = codec
+        self.compression = compression
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        conn = self._connection()
+        with conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+        self.keys = ProductKeyIndex(os.path.join(directory, PRODUCT_ALIASES_FILE))
+
+    def resolve_key(self, product_line: str):
+        """Canonical product_key for a product line (see mcp_server/product_keys.py)."""
+        return self.keys.resolve(product_line, product_key(product_line), self._has_rows)
+
+    def _has_rows(self, key: str):
+        return self._connection().execute(_COUNT, (key,)).fetchone()[0] > 0
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0, cached_statements=64,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def store_data(self, product_line: str, data: dict):
+        """Appends a new snapshot for a product line."""
+        payload = serialization.encode(data, codec=self.codec, compression=self.compression)
+        key = self.resolve_key(product_line)
+        conn = self._connection()
+        with conn:
+            # Take the write lock before reading the previous snapshot, so concurrent writers
+            # can't both compute their metrics against the same predecessor
+            conn.execute("BEGIN IMMEDIATE")
+            stored_at = time.time()
+            row = conn.execute(_SELECT_LATEST, (key,)).fetchone()
+            previous = serialization.decode(row[0]) if row else None
+            cursor = conn.execute(_INSERT, (key, product_line, data.get("date"), stored_at, payload))
+            self._insert_metrics(conn, cursor.lastrowid, key, snapshot_metrics(previous, data, stored_at))
+
+    def _insert_metrics(self, conn, snapshot_id, key, metrics):
+        overlap = metrics[-1]
+        conn.execute(_INSERT_METRICS, (snapshot_id, key) + tuple(metrics[:-1]) +
+                     (None if overlap != overlap else overlap,))
+
+    def _backfill_metrics(self, key):
+        """Computes metrics for snapshots written before the metrics table existed."""
+        conn = self._connection()
+        missing = conn.execute(_SELECT_UNINDEXED, (key,)).fetchall()
+        if not missing:
+            return
+        with conn:
+            for snapshot_id, stored_at, payload in missing:
+                row = conn.execute(_SELECT_PREVIOUS, (key, stored_at, stored_at, snapshot_id)).fetchone()
+                previous = serialization.decode(row[0]) if row else None
+                current = serialization.decode(payload)
+                self._insert_metrics(conn, snapshot_id, key, snapshot_metrics(previous, current, stored_at))
+
+    def get_data(self, product_line: str):
+        """Retrieves the latest snapshot for a product line, if it exists."""
+        return self.get_latest(product_line)
+
+    def get_latest(self, product_line: str):
+        """Returns the most recent snapshot, or None."""
+        row = self._connection().execute(_SELECT_LATEST, (self.resolve_key(product_line),)).fetchone()
+        return serialization.decode(row[0]) if row else None
+
+    def get_as_of(self, product_line: str, when):
+        """Returns the latest snapshot stored at or before `when`, or None."""
+        row = self._connection().execute(
+            _SELECT_AS_OF, (self.resolve_key(product_line), to_timestamp(when))).fetchone()
+        return serialization.decode(row[0]) if row else None
+
+    def get_history(self, product_line: str, n: int = 10):
+        """Returns the last n snapshots, oldest first."""
+        if n <= 0:
+            return []
+        rows = self._connection().execute(_SELECT_LAST_N, (self.resolve_key(product_line), n)).fetchall()
+        return [serialization.decode(row[0]) for row in reversed(rows)]
+
+    def snapshot_count(self, product_line: str):
+        """Number of snapshots stored for a product line."""
+        return self._connection().execute(_COUNT, (self.resolve_key(product_line),)).fetchone()[0]
+
+    def query_timeseries(self, product_line: str, start=None, end=None, freq=None):
+        """
+        Columnar sentiment, competitor-churn and trend-overlap series between
+        start and end (inclusive dates/datetimes; None means unbounded),
+        read from the indexed snapshot_metrics table.
+        """
+        key = self.resolve_key(product_line)
+        self._backfill_metrics(key)
+        low = to_timestamp(start, end_of_day=False) if start is not None else float("-inf")
+        high = to_timestamp(end) if end is not None else float("inf")
+        rows = self._connection().execute(_SELECT_METRICS, (key, low, high)).fetchall()
+        nan = float("nan")
+        return to_columns([row[:-1] + (nan if row[-1] is None else row[-1],) for row in rows], freq)
+
+    def compact(self, policy, now=None, dry_run=False):
+        """
+        Deletes snapshots outside the RetentionPolicy, rebuilds the churn metrics
+        of the survivors and VACUUMs the database. Returns counts and byte sizes.
+        """
+        db_files = [self.db_path, f"{self.db_path}-wal"]
+        stats = {"product_lines": 0, "snapshots_before": 0, "snapshots_after": 0,
+                 "files_removed": 0, "bytes_before": sum(disk_usage(p) for p in db_files), "bytes_after": 0}
+        conn = self._connection()
+        dropped_bytes = 0
+        keys = [row[0] for row in conn.execute(_SELECT_KEYS).fetchall()]
+        for key in keys:
+            timeline = conn.execute(_SELECT_TIMELINE, (key,)).fetchall()
+            keep = set(select_snapshots_to_keep([row[1] for row in timeline], policy, now))
+            stats["product_lines"] += 1
+            stats["snapshots_before"] += len(timeline)
+            stats["snapshots_after"] += len(keep)
+            dropped = [row for position, row in enumerate(timeline) if position not in keep]
+            dropped_bytes += sum(row[2] or 0 for row in dropped)
+            if dry_run or not dropped:
+                continue
+            with conn:
+                conn.executemany(_DELETE_SNAPSHOT, [(row[0],) for row in dropped])
+                conn.execute(_DELETE_METRICS, (key,))
+            # Churn is relative to the previous retained snapshot, so recompute it
+            self._backfill_metrics(key)
+
+        if dry_run:
+            stats["bytes_after"] = max(0, stats["bytes_before"] - dropped_bytes)
+            return stats
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+        stats["bytes_after"] = sum(disk_usage(p) for p in db_files)
+        return stats
+
+    def version(self, product_line: str):
+        """Change token for a product line: the id of its newest snapshot."""
+        return self.key_version(self.resolve_key(product_line))
+
+    def key_version(self, key: str):
+        """version() for an already resolved key."""
+        return self._connection().execute(_VERSION, (key,)).fetchone()[0]
+
+    def close(self):
+        """Closes the calling thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,128 @@
+"""
+Per-snapshot metrics and columnar time-series helpers for the memory stores.
+
+Metrics are computed once, when a snapshot is stored, by comparing it with
+the previous snapshot of the same product line. Queries then only read these
+small fixed-size rows instead of loading every stored snapshot.
+"""
+
+import math
+import re
+import struct
+from datetime import datetime, timedelta
+
+SENTIMENT_LABELS = ("Unknown", "Positive", "Negative", "Mixed")
+
+# stored_at, sentiment code, competitor count, competitors added, competitors removed,
+# trend count, trend overlap with the previous snapshot (NaN for the first one)
+METRICS_RECORD = struct.Struct("<dbHHHHf")
+
+METRIC_FIELDS = ("stored_at", "sentiment", "competitor_count", "competitors_added",
+                 "competitors_removed", "trend_count", "trend_overlap")
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _sentiment_code(snapshot):
+    label = ((snapshot or {}).get("reviews") or {}).get("overall_sentiment")
+    try:
+        return SENTIMENT_LABELS.index(label)
+    except ValueError:
+        return 0
+
+
+def _competitor_set(snapshot):
+    return {str(c).strip().lower() for c in (snapshot or {}).get("competitors") or [] if str(c).strip()}
+
+
+def _trend_terms(snapshot):
+    """Significant words across all trend bullets; LLM wording varies run to run,
+    so overlap is measured on vocabulary rather than on exact sentences."""
+    terms = set()
+    for trend in (snapshot or {}).get("trends") or []:
+        terms.update(w for w in _WORD.findall(str(trend).lower()) if len(w) > 3)
+    return terms
+
+
+def snapshot_metrics(previous, current, stored_at):
+    """Metrics row for `current`, compared against `previous` (may be None)."""
+    current_competitors = _competitor_set(current)
+    if previous is None:
+        added, removed, overlap = len(current_competitors), 0, float("nan")
+    else:
+        previous_competitors = _competitor_set(previous)
+        added = len(current_competitors - previous_competitors)
+        removed = len(previous_competitors - current_competitors)
+        previous_terms, current_terms = _trend_terms(previous), _trend_terms(current)
+        union = previous_terms | current_terms
+        overlap = len(previous_terms & current_terms) / len(union) if union else float("nan")
+    return (
+        float(stored_at),
+        _sentiment_code(current),
+        min(len(current_competitors), 0xFFFF),
+        min(added, 0xFFFF),
+        min(removed, 0xFFFF),
+        min(len((current or {}).get("trends") or []), 0xFFFF),
+        overlap,
+    )
+
+
+def _bucket(stored_at, freq):
+    day = datetime.fromtimestamp(stored_at).date()
+    if freq == "W":
+        day = day - timedelta(days=day.weekday())
+    elif freq == "M":
+        day = day.replace(day=1)
+    return day.isoformat()
+
+
+def to_columns(rows, freq=None):
+    """
+    Turns metrics rows (oldest first) into columnar series.
+    freq=None keeps one point per snapshot; "D", "W" or "M" aggregates per
+    day, week (starting Monday) or month: sentiment counts and churn are
+    summed, competitor/trend counts take the last value, overlap is averaged.
+    """
+    if freq not in (None, "D", "W", "M"):
+        raise ValueError("freq must be None, 'D', 'W' or 'M'")
+
+    columns = {
+        "dates": [],
+        "snapshots": [],
+        "sentiment_counts": {label: [] for label in SENTIMENT_LABELS},
+        "competitor_count": [],
+        "competitors_added": [],
+        "competitors_removed": [],
+        "trend_count": [],
+        "trend_overlap": [],
+    }
+    overlap_sums = []
+    overlap_counts = []
+    for row in rows:
+        stored_at, sentiment, competitors, added, removed, trends, overlap = row
+        label = (datetime.fromtimestamp(stored_at).isoformat(timespec="seconds")
+                 if freq is None else _bucket(stored_at, freq))
+        if not columns["dates"] or columns["dates"][-1] != label or freq is None:
+            columns["dates"].append(label)
+            columns["snapshots"].append(0)
+            for values in columns["sentiment_counts"].values():
+                values.append(0)
+            columns["competitor_count"].append(0)
+            columns["competitors_added"].append(0)
+            columns["competitors_removed"].append(0)
+            columns["trend_count"].append(0)
+            overlap_sums.append(0.0)
+            overlap_counts.append(0)
+        columns["snapshots"][-1] += 1
+        columns["sentiment_counts"][SENTIMENT_LABELS[sentiment]][-1] += 1
+        columns["competitor_count"][-1] = competitors
+        columns["competitors_added"][-1] += added
+        columns["competitors_removed"][-1] += removed
+        columns["trend_count"][-1] = trends
+        if not math.isnan(overlap):
+            overlap_sums[-1] += overlap
+            overlap_counts[-1] += 1
+
+    columns["trend_overlap"] = [round(total / count, 4) if count else None
+                                for total, count in zip(overlap_sums, overlap_counts)]
+    return columns
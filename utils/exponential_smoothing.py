@@ -0,0 +1,147 @@
+"""
+Vectorized Holt-Winters (additive, damped-trend exponential smoothing).
+
+Every series of a (series x periods) matrix is smoothed in one pass over
+the periods, with numpy operations across series and across a small grid of
+smoothing parameters; each series keeps the parameters with the lowest
+one-step-ahead squared error. Forecasts come with prediction intervals from
+the ETS(A,Ad,A) forecast variance. Fitting a few hundred monthly series
+takes milliseconds, so no model is persisted.
+
+NaN marks a missing period; the series' own one-step forecast stands in for it.
+Series in one matrix may start at different periods (leading NaN).
+"""
+
+import itertools
+
+import numpy as np
+
+SEASON_LENGTH = 12
+DAMPING = 0.98
+# Candidate smoothing parameters: level, trend (as a fraction of the level parameter) and season
+ALPHAS = (0.1, 0.3, 0.5, 0.8)
+BETAS = (0.01, 0.1, 0.3)
+GAMMAS = (0.05, 0.2, 0.5)
+Z_95 = 1.96
+
+
+def _nanmean_rows(Y):
+    """Mean of the observed values of every row; NaN for a row with none (without numpy's warning)."""
+    counts = (~np.isnan(Y)).sum(axis=1)
+    return np.where(counts > 0, np.nansum(Y, axis=1) / np.maximum(counts, 1), np.nan)
+
+
+def _initial_states(Y, m, seasonal):
+    """
+    Level, trend and seasonal indices of every series, estimated from its own first
+    observed periods (series in a panel may start at different times), plus the
+    index of that first period and whether the series gets a seasonal component.
+    The level is set one period before the series starts.
+    """
+    series, periods = Y.shape
+    observed = ~np.isnan(Y)
+    rows = np.arange(series)
+    start = observed.argmax(axis=1)
+
+    # Non-seasonal: trend from the first to the last observed period of each series
+    last_index = periods - 1 - observed[:, ::-1].argmax(axis=1)
+    first, last = np.nan_to_num(Y[rows, start]), np.nan_to_num(Y[rows, last_index])
+    trend = (last - first) / np.maximum(last_index - start, 1)
+    level = first - trend
+    season = np.zeros((series, m))
+    seasonal_rows = np.zeros(series, dtype=bool)
+    if not seasonal:
+        return level, trend, season, start, seasonal_rows
+
+    # Seasonal: the first two seasons after each series' own start, for series with two full seasons
+    window = start[:, None] + np.arange(2 * m)
+    padded = np.concatenate([Y, np.full((series, 2 * m), np.nan)], axis=1)
+    seasons = padded[rows[:, None], window]
+    first_mean, second_mean = _nanmean_rows(seasons[:, :m]), _nanmean_rows(seasons[:, m:])
+    seasonal_rows = (periods - start >= 2 * m) & np.isfinite(first_mean) & np.isfinite(second_mean)
+    seasonal_trend = (second_mean - first_mean) / m
+    # Seasonal indices around the first season's trend line, placed at their calendar positions
+    detrended = seasons[:, :m] - (first_mean[:, None] + seasonal_trend[:, None] * (np.arange(m) - (m - 1) / 2))
+    positions = (start[:, None] + np.arange(m)) % m
+    np.put_along_axis(season, positions, np.where(np.isnan(detrended), 0.0, detrended), axis=1)
+    season[~seasonal_rows] = 0.0
+    level = np.where(seasonal_rows, first_mean - seasonal_trend * (m + 1) / 2, level)
+    trend = np.where(seasonal_rows, seasonal_trend, trend)
+    return level, trend, season, start, seasonal_rows
+
+
+def fit_holt_winters(Y, season_length=SEASON_LENGTH, damping=DAMPING):
+    """
+    Fits every row of Y (series x periods). Each series is fitted from its first
+    observed period; seasonality is only estimated for series with at least two
+    full seasons of data from there. Returns a dict of per-series arrays: final
+    'level', 'trend' and 'season', the chosen 'alpha', 'beta', 'gamma', the
+    residual 'sigma', plus 'periods', 'season_length' and 'damping'.
+    """
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    series, periods = Y.shape
+    m = season_length
+    seasonal = periods >= 2 * m
+    grid = np.array(list(itertools.product(ALPHAS, BETAS, GAMMAS if seasonal else (0.0,))))
+    alpha, beta, gamma = (grid[:, i, None] for i in range(3))  # each (combos, 1)
+
+    level0, trend0, season0, start, seasonal_rows = _initial_states(Y, m, seasonal)
+    level = np.broadcast_to(level0, (len(grid), series)).copy()
+    trend = np.broadcast_to(trend0, (len(grid), series)).copy()
+    season = np.broadcast_to(season0, (len(grid), series, m)).copy()
+    sse = np.zeros((len(grid), series))
+    # Series without a seasonal component never update their (zero) seasonal indices
+    gamma = gamma * seasonal_rows
+
+    for t in range(periods):
+        index = t % m
+        predicted = level + damping * trend + season[:, :, index]
+        error = np.nan_to_num(Y[:, t] - predicted)
+        sse += error * error
+        # States of a series are held until its first observation
+        active = t >= start
+        level = np.where(active, level + damping * trend + alpha * error, level)
+        trend = np.where(active, damping * trend + alpha * beta * error, trend)
+        season[:, :, index] += gamma * error
+
+    best = sse.argmin(axis=0)
+    columns = np.arange(series)
+    observed = np.maximum((~np.isnan(Y)).sum(axis=1) - 3, 1)
+    return {
+        'level': level[best, columns],
+        'trend': trend[best, columns],
+        'season': season[best, columns],
+        'alpha': grid[best, 0],
+        'beta': grid[best, 1],
+        'gamma': grid[best, 2] * seasonal_rows,
+        'sigma': np.sqrt(sse[best, columns] / observed),
+        'periods': periods,
+        'season_length': m,
+        'damping': damping
+    }
+
+
+def forecast_holt_winters(params, horizon, z=Z_95):
+    """Point forecasts and prediction intervals, each (series x horizon)."""
+    m, phi = params['season_length'], params['damping']
+    steps = np.arange(1, horizon + 1)
+    damped = np.cumsum(phi ** steps)  # phi + ... + phi^h
+    index = (params['periods'] + steps - 1) % m
+    mean = (params['level'][:, None] + damped * params['trend'][:, None]
+            + params['season'][:, index])
+
+    # Forecast variance: sigma^2 * (1 + sum over j < h of c_j^2)
+    alpha, beta, gamma = (params[name][:, None] for name in ('alpha', 'beta', 'gamma'))
+    c = alpha * (1 + beta * damped[:-1]) + gamma * (steps[:-1] % m == 0)
+    variance = 1 + np.concatenate([np.zeros((len(mean), 1)), np.cumsum(c * c, axis=1)], axis=1)
+    half_width = z * params['sigma'][:, None] * np.sqrt(variance)
+    return mean, mean - half_width, mean + half_width
+
+
+def holt_winters(Y, horizon, season_length=SEASON_LENGTH, z=Z_95):
+    """Fits and forecasts in one call; a 1-D series returns 1-D (mean, lower, upper)."""
+    Y = np.asarray(Y, dtype=float)
+    mean, lower, upper = forecast_holt_winters(fit_holt_winters(Y, season_length), horizon, z)
+    if Y.ndim == 1:
+        return mean[0], lower[0], upper[0]
+    return mean, lower, upper
@@ -0,0 +1,96 @@
+"""
+In-process cache of forecast results.
+
+Forecasts are keyed by canonical product key, engine, horizon and a
+fingerprint of the history (and any other inputs) they were computed from.
+New history, e.g. a newly stored snapshot, gives a new fingerprint, so stale
+forecasts are never served. Entries expire after a TTL, and the least
+recently used ones are evicted beyond max_entries.
+
+Set MARKETMATE_FORECAST_CACHE=0 to disable, MARKETMATE_FORECAST_CACHE_TTL
+(seconds, default one hour) and MARKETMATE_FORECAST_CACHE_SIZE to tune it.
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from mcp_server.product_keys import normalize_product_line
+
+FORECAST_CACHE_ENABLED = os.getenv("MARKETMATE_FORECAST_CACHE", "1") not in ("0", "false", "False")
+FORECAST_CACHE_TTL = float(os.getenv("MARKETMATE_FORECAST_CACHE_TTL", "3600"))
+FORECAST_CACHE_SIZE = int(os.getenv("MARKETMATE_FORECAST_CACHE_SIZE", "64"))
+
+
+class ForecastCache:
+    """
+    Forecasts keyed by (product key, engine, horizon, history fingerprint).
+    Callers get their own copy of a cached forecast, so they may modify it.
+    """
+
+    def __init__(self, max_entries=FORECAST_CACHE_SIZE, ttl_seconds=FORECAST_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+    @staticmethod
+    def _key(product_line, engine, horizon, history_fingerprint):
+        return normalize_product_line(product_line), engine, horizon, history_fingerprint
+
+    def get(self, product_line, engine, horizon, history_fingerprint):
+        """Returns a copy of the cached forecast, or None when absent or expired."""
+        key = self._key(product_line, engine, horizon, history_fingerprint)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                self.stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            forecast = entry[1]
+        return copy.deepcopy(forecast)
+
+    def put(self, product_line, engine, horizon, history_fingerprint, forecast):
+        """Caches a copy of forecast and returns forecast."""
+        key = self._key(product_line, engine, horizon, history_fingerprint)
+        entry = (time.monotonic(), copy.deepcopy(forecast))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        return forecast
+
+    def invalidate(self, product_line=None):
+        """Drops cached forecasts for one product line, or all of them."""
+        with self._lock:
+            if product_line is None:
+                self._entries.clear()
+                return
+            product = normalize_product_line(product_line)
+            for key in [k for k in self._entries if k[0] == product]:
+                del self._entries[key]
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def default_forecast_cache():
+    """Process-wide forecast cache, or None when MARKETMATE_FORECAST_CACHE=0."""
+    global _default_cache
+    if not FORECAST_CACHE_ENABLED:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ForecastCache()
+        return _default_cache
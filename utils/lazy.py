@@ -0,0 +1,48 @@
+"""
+Deferred imports for heavy optional dependencies.
+
+    pd = lazy_import("pandas")
+    sklearn = lazy_import("sklearn", submodules=("ensemble", "linear_model"))
+
+binds a stand-in that imports the real module on first attribute access,
+so importing a module that only needs pandas inside its functions does not
+slow down CLI and dashboard start-up. Loads are serialized by one lock:
+first-time imports of packages like scikit-learn are not safe to run from
+several threads at once.
+"""
+
+import importlib
+import threading
+
+_import_lock = threading.RLock()
+
+
+class LazyModule:
+    """Imports `name` (and `name.<submodule>` for each submodule) the first time it is used."""
+
+    def __init__(self, name, submodules=()):
+        self._name = name
+        self._submodules = tuple(submodules)
+        self._module = None
+
+    def load(self):
+        """Imports the module now, if it is not loaded yet, and returns it."""
+        if self._module is None:
+            with _import_lock:
+                if self._module is None:
+                    module = importlib.import_module(self._name)
+                    for submodule in self._submodules:
+                        importlib.import_module(f"{self._name}.{submodule}")
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name, submodules=()):
+    return LazyModule(name, submodules)
@@ -0,0 +1,185 @@
+"""
+Persisted registry of trained forecasting models.
+
+Models are stored under data/models/<product key>/ and identified by the
+product line, a hash of the feature schema (model type, parameters and
+feature columns) and a fingerprint of the training data. Entries are loaded
+lazily from disk into a small in-memory LRU, and are treated as stale (and
+retrained by the caller) once they are older than max_age_seconds. After
+every save, model files past that age are deleted, then the oldest ones until
+the directory fits in max_bytes.
+
+Set MARKETMATE_MODEL_CACHE=0 to disable, MARKETMATE_MODEL_DIR to move it,
+MARKETMATE_MODEL_MAX_AGE (seconds, default one week) to change staleness and
+MARKETMATE_MODEL_MAX_BYTES (default 256 MiB) to bound disk use.
+"""
+
+import glob
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from mcp_server.product_keys import normalize_product_line
+
+MODEL_CACHE_ENABLED = os.getenv("MARKETMATE_MODEL_CACHE", "1") not in ("0", "false", "False")
+MODEL_DIR = os.getenv("MARKETMATE_MODEL_DIR", os.path.join("data", "models"))
+MODEL_MAX_AGE = float(os.getenv("MARKETMATE_MODEL_MAX_AGE", str(7 * 24 * 3600)))
+MODEL_MAX_BYTES = int(os.getenv("MARKETMATE_MODEL_MAX_BYTES", str(256 * 1024 * 1024)))
+
+
+def fingerprint(*arrays):
+    """Short content hash of the training arrays (shape, dtype and values)."""
+    digest = hashlib.blake2b(digest_size=8)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.shape}{array.dtype}".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def schema_hash(schema):
+    """Stable hash of a feature schema such as ("RandomForestRegressor", 100, ("month", ...))."""
+    return hashlib.blake2b(repr(schema).encode(), digest_size=6).hexdigest()
+
+
+class ModelRegistry:
+    """
+    Trained model bundles keyed by (product line, schema, data fingerprint).
+    A bundle is any picklable dict; the registry adds 'fingerprint' and 'trained_at'.
+    """
+
+    def __init__(self, directory=MODEL_DIR, max_entries=32, max_age_seconds=MODEL_MAX_AGE,
+                 max_bytes=MODEL_MAX_BYTES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_loads": 0, "misses": 0, "stale": 0, "saves": 0, "pruned": 0}
+
+    def _paths(self, product_line, schema):
+        folder = os.path.join(self.directory, normalize_product_line(product_line))
+        return folder, os.path.join(folder, f"{schema_hash(schema)}_")
+
+    def _fresh(self, bundle, data_fingerprint):
+        if data_fingerprint is not None and bundle.get("fingerprint") != data_fingerprint:
+            return False
+        if time.time() - bundle.get("trained_at", 0) > self.max_age_seconds:
+            self.stats["stale"] += 1
+            return False
+        return True
+
+    def _load_latest(self, prefix):
+        import joblib
+        candidates = sorted(glob.glob(f"{prefix}*.joblib"), key=os.path.getmtime, reverse=True)
+        for path in candidates:
+            try:
+                return joblib.load(path)
+            except Exception as e:
+                print(f"[ModelRegistry] -> Could not load {path}: {e}")
+        return None
+
+    def _remember(self, key, bundle):
+        self._entries[key] = bundle
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, product_line, schema, data_fingerprint=None):
+        """
+        Returns a fresh bundle for the product line and schema, or None.
+        With data_fingerprint, only a model trained on exactly that data matches.
+        """
+        _, prefix = self._paths(product_line, schema)
+        with self._lock:
+            bundle = self._entries.get(prefix)
+            if bundle is not None and self._fresh(bundle, data_fingerprint):
+                self._entries.move_to_end(prefix)
+                self.stats["memory_hits"] += 1
+                return bundle
+            if bundle is None:
+                # Lazy load: only touch the disk on first use in this process
+                bundle = self._load_latest(prefix)
+                if bundle is not None:
+                    self._remember(prefix, bundle)
+                    if self._fresh(bundle, data_fingerprint):
+                        self.stats["disk_loads"] += 1
+                        return bundle
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, product_line, schema, data_fingerprint, bundle):
+        """Saves a trained bundle, replacing older models for the same schema."""
+        import joblib
+        folder, prefix = self._paths(product_line, schema)
+        bundle = dict(bundle, fingerprint=data_fingerprint, trained_at=time.time())
+        path = f"{prefix}{data_fingerprint}.joblib"
+        with self._lock:
+            self._remember(prefix, bundle)
+            try:
+                os.makedirs(folder, exist_ok=True)
+                tmp_path = f"{path}.tmp{os.getpid()}"
+                joblib.dump(bundle, tmp_path)
+                os.replace(tmp_path, path)
+                for old_path in glob.glob(f"{prefix}*.joblib"):
+                    if old_path != path:
+                        os.remove(old_path)
+                self.stats["saves"] += 1
+            except Exception as e:
+                print(f"[ModelRegistry] -> Could not save model for '{product_line}': {e}")
+            self._prune(keep=path)
+        return bundle
+
+    def _prune(self, keep=None):
+        """Deletes model files past max_age_seconds, then the oldest until the total fits in max_bytes."""
+        files = []
+        for path in glob.glob(os.path.join(self.directory, "*", "*.joblib")):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        cutoff = time.time() - self.max_age_seconds
+        for mtime, size, path in files:
+            if path == keep or (mtime >= cutoff and total <= self.max_bytes):
+                continue
+            try:
+                os.remove(path)
+                total -= size
+                self.stats["pruned"] += 1
+                if not os.listdir(os.path.dirname(path)):
+                    os.rmdir(os.path.dirname(path))
+            except OSError:
+                continue
+
+    def invalidate(self, product_line=None):
+        """Forgets in-memory models for one product line, or all of them (files are kept)."""
+        with self._lock:
+            if product_line is None:
+                self._entries.clear()
+                return
+            folder = os.path.join(self.directory, normalize_product_line(product_line))
+            for key in [k for k in self._entries if os.path.dirname(k) == folder]:
+                del self._entries[key]
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def default_registry():
+    """Process-wide registry, or None when MARKETMATE_MODEL_CACHE=0."""
+    global _default_registry
+    if not MODEL_CACHE_ENABLED:
+        return None
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = ModelRegistry()
+        return _default_registry
@@ -0,0 +1,33 @@
+"""
+Concurrent execution of independent forecast components.
+
+Set MARKETMATE_FORECAST_WORKERS to change the default number of worker
+threads (1 runs components one after another).
+"""
+
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+FORECAST_WORKERS = int(os.getenv("MARKETMATE_FORECAST_WORKERS", "5"))
+
+
+def run_components(tasks, executor=None, max_workers=None):
+    """
+    Runs {name: callable} concurrently and returns {name: result} in the same order.
+    Uses `executor` when given (it is left running), otherwise a temporary thread pool.
+    Each task runs in a copy of the caller's context so trace spans keep their run id.
+    """
+    max_workers = FORECAST_WORKERS if max_workers is None else max_workers
+    if executor is None and (max_workers <= 1 or len(tasks) <= 1):
+        return {name: task() for name, task in tasks.items()}
+
+    owned = executor is None
+    if owned:
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(tasks)), thread_name_prefix="forecast")
+    try:
+        futures = {name: executor.submit(contextvars.copy_context().run, task) for name, task in tasks.items()}
+        return {name: future.result() for name, future in futures.items()}
+    finally:
+        if owned:
+            executor.shutdown(wait=True)
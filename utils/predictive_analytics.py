@@ -1,162 +1,550 @@
-import pandas as pd
+import os
 import numpy as np
 from datetime import datetime, timedelta
-import random
-from sklearn.linear_model import LinearRegression
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-import yfinance as yf
 import warnings
+from utils.exponential_smoothing import holt_winters
+from utils.forecast_cache import default_forecast_cache
+from utils.lazy import lazy_import
+from utils.model_registry import default_registry, fingerprint
+from utils.parallel import run_components
 warnings.filterwarnings('ignore')
 
+# pandas and scikit-learn are imported on first use so importing this module stays cheap
+pd = lazy_import('pandas')
+sklearn = lazy_import('sklearn', submodules=('ensemble', 'linear_model', 'model_selection', 'preprocessing'))
+
+# Feature schemas identify compatible models in the registry; change them when features change
+SALES_FEATURES = ['month', 'quarter', 'day_of_week', 'price']
+SALES_SCHEMA = ('RandomForestRegressor', 100, tuple(SALES_FEATURES))
+GROWTH_SCHEMA = ('LinearRegression', 'monthly_growth_rate')
+PRICE_SCHEMA = ('LinearRegression', 'monthly_price')
+# Forecasting engines: 'forest' (random forest sales model, linear trends) or 'ets' (Holt-Winters with
+# prediction intervals, see utils/exponential_smoothing.py); chosen per instance or per call
+ENGINES = ('forest', 'ets')
+FORECAST_ENGINE = os.getenv('MARKETMATE_FORECAST_ENGINE', 'forest')
+# Compact column types for daily history: small ints for calendar fields, 32-bit measures,
+# categorical product keys (see compact_history)
+HISTORY_DTYPES = {
+    'sales': np.int32,
+    'price': np.float32,
+    'growth_rate': np.float32,
+    'month': np.int8,
+    'quarter': np.int8,
+    'day_of_week': np.int8
+}
+# Months of history shared by the components of a comprehensive forecast
+HISTORY_MONTHS = 36
+# Incremental updates: trees added per update, forest size cap, tolerated rise in relative error
+# before a full retrain, and how many recent monthly prices a drifting price trend is refit on
+INCREMENTAL_TREES = 10
+MAX_TREES = 200
+DRIFT_TOLERANCE = 0.15
+PRICE_REFIT_WINDOW = 24
+# Panel forecasts: one forest over every series; rows sampled per tree to bound training time
+PANEL_MAX_SAMPLES = 20000
+
+# Season of each calendar month (index 1-12) and demand recommendations by threshold (>4000, >3000, else)
+SEASON_BY_MONTH = [None, 'Winter', 'Winter', 'Spring', 'Spring', 'Spring', 'Summer',
+                   'Summer', 'Summer', 'Fall', 'Fall', 'Fall', 'Winter']
+SEASONAL_RECOMMENDATIONS = ('Increase production and marketing efforts',
+                            'Maintain current production levels',
+                            'Consider promotional activities to boost demand')
+
+def compact_history(data):
+    """Daily history with HISTORY_DTYPES applied and product_line (if present) as a category.
+    Frames built from dicts or loaded from storage default to int64/float64/object columns."""
+    dtypes = {column: dtype for column, dtype in HISTORY_DTYPES.items() if column in data.columns}
+    if 'sales' in dtypes:
+        data = data.assign(sales=data['sales'].round())
+    if 'product_line' in data.columns:
+        dtypes['product_line'] = 'category'
+    return data.astype(dtypes)
+
+def seasonal_profiles(data, by='product_line'):
+    """Mean daily sales per month of year and per quarter for many series at once.
+    Returns two DataFrames (one row per `by` value; columns 1-12 and 1-4)."""
+    month_profile = data.groupby([by, 'month'], observed=True)['sales'].mean().unstack('month')
+    quarter_profile = data.groupby([by, 'quarter'], observed=True)['sales'].mean().unstack('quarter')
+    return month_profile, quarter_profile
+
+def batched_linear_trend(Y):
+    """Least-squares line through every row of Y (series x periods) at once; NaN marks missing periods.
+    Returns (slopes, intercepts) against the period index 0..T-1."""
+    mask = ~np.isnan(Y)
+    values = np.where(mask, Y, 0.0)
+    x = np.arange(Y.shape[1], dtype=float)
+    n, sx, sy = mask.sum(axis=1), mask @ x, values.sum(axis=1)
+    sxx, sxy = mask @ (x * x), values @ x
+    denominator = n * sxx - sx * sx
+    slopes = np.divide(n * sxy - sx * sy, denominator, out=np.zeros(len(Y)), where=denominator > 0)
+    intercepts = (sy - slopes * sx) / np.maximum(n, 1)
+    return slopes, intercepts
+
+def interval_confidence(mean, lower, upper):
+    """0-1 score from the width of a prediction interval relative to its forecast"""
+    half_width = (np.asarray(upper) - np.asarray(lower)) / 2
+    return np.clip(1 - half_width / np.maximum(np.abs(mean), 1e-9), 0, 1).round(2)
+
+def forecast_months(count):
+    """'%Y-%m' labels of the next `count` 30-day steps, starting now"""
+    now = datetime.now()
+    return [(now + timedelta(days=30*i)).strftime('%Y-%m') for i in range(count)]
+
+def sales_fingerprint(data):
+    """Registry fingerprint of the sales training data; the same for any column dtypes"""
+    return fingerprint(data[SALES_FEATURES].to_numpy(dtype=float), data['sales'].to_numpy(dtype=float))
+
+def price_fingerprint(monthly):
+    """Registry fingerprint of the monthly mean prices a price trend is fitted on"""
+    return fingerprint(monthly['price'].to_numpy(dtype=float))
+
+def forecast_fingerprint(data, *inputs):
+    """Forecast cache fingerprint of the daily history (every column) and other inputs such as competitors.
+    Dates count by day, so seeded history generated again on the same day has the same fingerprint."""
+    if 'date' in data:
+        data = data.assign(date=data['date'].dt.floor('D'))
+    rows = pd.util.hash_pandas_object(data, index=False).to_numpy()
+    return fingerprint(np.array(list(data.columns)), rows, *(np.array(repr(value)) for value in inputs))
+
+def mean_relative_error(actual, predicted):
+    """Mean absolute percentage error (as a fraction)"""
+    actual = np.asarray(actual, dtype=float)
+    return float(np.mean(np.abs(actual - predicted) / np.maximum(np.abs(actual), 1e-9)))
+
+class HistoricalContext:
+    """Daily history of one product line, built once per forecast and shared by every component,
+    with the monthly and seasonal aggregates the components need computed up front"""
+    
+    def __init__(self, product_line, data, reusable=True):
+        self.product_line = product_line
+        self.data = data
+        # False for history drawn from an unseeded random stream: models trained on it are never registered
+        self.reusable = reusable
+        if data.empty:
+            self.monthly = pd.DataFrame(columns=['date', 'sales', 'avg_sales', 'price', 'growth_rate'])
+            self.month_of_year = pd.Series(dtype=float)
+            self.quarter_of_year = pd.Series(dtype=float)
+            return
+        
+        # One row per calendar month: total and mean daily sales, mean price and growth rate
+        self.monthly = data.groupby(data['date'].dt.to_period('M')).agg(
+            sales=('sales', 'sum'),
+            avg_sales=('sales', 'mean'),
+            price=('price', 'mean'),
+            growth_rate=('growth_rate', 'mean')
+        ).reset_index()
+        
+        # Seasonal profiles: mean daily sales per month of the year (1-12) and per quarter (1-4)
+        self.month_of_year = data.groupby('month')['sales'].mean()
+        self.quarter_of_year = data.groupby('quarter')['sales'].mean()
+    
+    @property
+    def empty(self):
+        return self.data.empty
+
 class PredictiveAnalytics:
     """AI-powered predictive analytics for market analysis"""
     
-    def __init__(self):
+    def __init__(self, seed=None, registry=None, n_jobs=None, executor=None, max_workers=None, engine=None,
+                 forecast_cache=None):
         self.sales_model = None
         self.growth_model = None
         self.price_model = None
         self.seasonal_model = None
-        self.scaler = StandardScaler()
+        self.scaler = None
+        # Training metadata for incremental updates (last observation, baseline accuracy, drift history)
+        self.sales_state = None
+        self.price_state = None
+        # Seeded generator for synthetic history; pass a seed for reproducible data
+        self.rng = np.random.default_rng(seed)
+        self.seeded = seed is not None
+        # Trained models are reused across runs; pass registry=False to always retrain
+        self.registry = default_registry() if registry is None else (registry or None)
+        # Comprehensive forecasts are reused for the same history; pass forecast_cache=False to always recompute
+        self.forecast_cache = default_forecast_cache() if forecast_cache is None else (forecast_cache or None)
+        # n_jobs is passed to the forest; executor/max_workers run forecast components concurrently
+        self.n_jobs = n_jobs
+        self.executor = executor
+        self.max_workers = max_workers
+        # Default forecasting engine; every forecast method also takes engine=
+        self.engine = engine or FORECAST_ENGINE
+    
+    def _engine(self, engine):
+        """Resolve and validate an engine. scikit-learn is loaded here for the forest engine, before
+        any registry load or fit, so concurrent forecast components never import it at the same time."""
+        engine = engine or self.engine
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown forecasting engine '{engine}' (expected one of {', '.join(ENGINES)})")
+        if engine == 'forest':
+            sklearn.load()
+        return engine
+        
+    def generate_historical_columns(self, product_line, months=24, rng=None):
+        """Generate realistic historical data as a dict of column arrays (one row per day)"""
+        rng = rng or self.rng
+        end = datetime.now()
+        dates = pd.date_range(start=end - timedelta(days=months*30), end=end, freq='D')
+        n = len(dates)
+        day = np.arange(n)
+        
+        # Base values with realistic ranges
+        base_sales = rng.integers(1000, 5000, endpoint=True)
+        base_price = rng.uniform(50, 300)
+        base_growth = rng.uniform(0.05, 0.15)
+        
+        # Seasonal pattern, trend and random noise for every day at once
+        seasonal_factor = 1 + 0.3 * np.sin(2 * np.pi * day / 365)
+        trend_factor = 1 + (base_growth * day / 365)
+        noise = rng.uniform(0.9, 1.1, n)
+        
+        sales = (base_sales * seasonal_factor * trend_factor * noise).astype(np.int64)
+        price = base_price * (1 + 0.1 * np.sin(2 * np.pi * day / 90)) * noise
+        growth_rate = base_growth + rng.uniform(-0.02, 0.02, n)
+        month = dates.month.to_numpy()
         
-    def generate_historical_data(self, product_line, months=24):
+        columns = {
+            'sales': np.maximum(sales, 0),
+            'price': np.maximum(price, 10),
+            'growth_rate': np.maximum(growth_rate, 0),
+            'month': month,
+            'quarter': (month - 1) // 3 + 1,
+            'day_of_week': dates.dayofweek.to_numpy()
+        }
+        return {'date': dates.to_numpy(),
+                **{name: values.astype(HISTORY_DTYPES[name]) for name, values in columns.items()}}
+    
+    def generate_historical_data(self, product_line, months=24, rng=None):
         """Generate realistic historical data for training"""
         try:
-            dates = pd.date_range(start=datetime.now() - timedelta(days=months*30), 
-                                end=datetime.now(), freq='D')
-            
-            # Base values with realistic ranges
-            base_sales = random.randint(1000, 5000)
-            base_price = random.uniform(50, 300)
-            base_growth = random.uniform(0.05, 0.15)
-            
-            data = []
-            for i, date in enumerate(dates):
-                # Add seasonal patterns
-                seasonal_factor = 1 + 0.3 * np.sin(2 * np.pi * i / 365)
-                
-                # Add trend
-                trend_factor = 1 + (base_growth * i / 365)
-                
-                # Add random noise
-                noise = random.uniform(0.9, 1.1)
-                
-                sales = int(base_sales * seasonal_factor * trend_factor * noise)
-                price = base_price * (1 + 0.1 * np.sin(2 * np.pi * i / 90)) * noise
-                growth_rate = base_growth + random.uniform(-0.02, 0.02)
-                
-                data.append({
-                    'date': date,
-                    'sales': max(0, sales),
-                    'price': max(10, price),
-                    'growth_rate': max(0, growth_rate),
-                    'month': date.month,
-                    'quarter': (date.month - 1) // 3 + 1,
-                    'day_of_week': date.weekday()
-                })
-            
-            return pd.DataFrame(data)
+            return pd.DataFrame(self.generate_historical_columns(product_line, months, rng))
         except Exception as e:
             print(f"Error generating historical data: {e}")
             return pd.DataFrame()
     
-    def train_sales_forecasting_model(self, historical_data):
-        """Train sales forecasting model"""
+    def _history(self, product_line, months=HISTORY_MONTHS, rng=None, data=None):
+        """Daily history for a forecast and whether it can be seen again (see HistoricalContext.reusable)"""
+        if data is None:
+            return self.generate_historical_data(product_line, months, rng), self.seeded
+        return compact_history(data), True
+    
+    def build_context(self, product_line, months=HISTORY_MONTHS, rng=None, data=None):
+        """Shared history for a forecast: `data` when given (e.g. loaded from storage), otherwise generated"""
+        data, reusable = self._history(product_line, months, rng, data)
+        return HistoricalContext(product_line, data, reusable=reusable)
+    
+    def train_sales_forecasting_model(self, historical_data, product_line=None):
+        """Train sales forecasting model, reusing a registered model trained on the same data"""
         try:
             if historical_data.empty:
                 return False
             
             # Prepare features
-            X = historical_data[['month', 'quarter', 'day_of_week', 'price']].values
+            X = historical_data[SALES_FEATURES].values
             y = historical_data['sales'].values
+            data_fingerprint = sales_fingerprint(historical_data)
+            if self.sales_model and self.sales_state and self.sales_state.get('fingerprint') == data_fingerprint:
+                return True
+            if product_line and self.registry:
+                bundle = self.registry.get(product_line, SALES_SCHEMA, data_fingerprint)
+                if bundle is not None:
+                    self._use_sales_bundle(bundle)
+                    return True
             
             # Split data
-            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+            X_train, X_test, y_train, y_test = sklearn.model_selection.train_test_split(X, y, test_size=0.2,
+                                                                                        random_state=42)
             
             # Scale features
+            self.scaler = sklearn.preprocessing.StandardScaler()
             X_train_scaled = self.scaler.fit_transform(X_train)
             X_test_scaled = self.scaler.transform(X_test)
             
             # Train model
-            self.sales_model = RandomForestRegressor(n_estimators=100, random_state=42)
+            self.sales_model = sklearn.ensemble.RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=self.n_jobs)
             self.sales_model.fit(X_train_scaled, y_train)
             
             # Calculate accuracy
             accuracy = self.sales_model.score(X_test_scaled, y_test)
             print(f"Sales forecasting model accuracy: {accuracy:.2f}")
             
+            self.sales_state = {
+                'last_date': historical_data['date'].max(),
+                'baseline_error': mean_relative_error(y_test, self.sales_model.predict(X_test_scaled)),
+                'recent_errors': [],
+                'updates': 0,
+                'fingerprint': data_fingerprint
+            }
+            if product_line and self.registry:
+                self.registry.put(product_line, SALES_SCHEMA, data_fingerprint,
+                                  {'model': self.sales_model, 'scaler': self.scaler, 'accuracy': accuracy,
+                                   'state': self.sales_state})
             return True
         except Exception as e:
             print(f"Error training sales forecasting model: {e}")
             return False
     
-    def predict_sales_forecast(self, product_line, months_ahead=12):
-        """Predict sales for future months"""
+    def _use_sales_bundle(self, bundle):
+        """Adopt a registered sales model and its training metadata"""
+        self.sales_model, self.scaler = bundle['model'], bundle['scaler']
+        self.sales_state = dict(bundle.get('state') or {
+            'last_date': None, 'baseline_error': None, 'recent_errors': [], 'updates': 0
+        }, fingerprint=bundle.get('fingerprint'))
+    
+    def update_sales_model(self, new_data, product_line=None, history=None):
+        """Update the sales forest with observations newer than its last fit.
+        New trees are warm-started on the new rows only (oldest trees are dropped past MAX_TREES).
+        If the model's relative error on the new rows exceeds twice its baseline error, and the
+        baseline by more than DRIFT_TOLERANCE, it is retrained from scratch on `history` plus the new rows.
+        Returns 'unchanged', 'incremental', 'retrained' or 'failed'."""
         try:
+            if not self.sales_model and product_line and self.registry:
+                # Warm-start a model trained on exactly `history`; without history, continue the latest one
+                bundle = self.registry.get(product_line, SALES_SCHEMA,
+                                           None if history is None else sales_fingerprint(history))
+                if bundle is not None:
+                    self._use_sales_bundle(bundle)
+            full_data = new_data if history is None else pd.concat([history, new_data], ignore_index=True)
             if not self.sales_model:
-                # Generate and train model if not exists
-                historical_data = self.generate_historical_data(product_line)
-                if not self.train_sales_forecasting_model(historical_data):
+                return 'retrained' if self.train_sales_forecasting_model(full_data, product_line) else 'failed'
+            
+            state = self.sales_state
+            if state['last_date'] is not None:
+                new_data = new_data[new_data['date'] > state['last_date']]
+            if new_data.empty:
+                return 'unchanged'
+            
+            X = self.scaler.transform(new_data[SALES_FEATURES].values)
+            y = new_data['sales'].values
+            
+            # Drift check: error of the current model on data it has not seen
+            error = mean_relative_error(y, self.sales_model.predict(X))
+            state['recent_errors'] = (state['recent_errors'] + [error])[-10:]
+            if state['baseline_error'] is None:
+                state['baseline_error'] = error
+            baseline = state['baseline_error']
+            if error > max(2 * baseline, baseline + DRIFT_TOLERANCE):
+                print(f"Sales model drift detected (error {error:.2f} vs {baseline:.2f}); retraining")
+                return 'retrained' if self.train_sales_forecasting_model(full_data, product_line) else 'failed'
+            
+            # Grow the ensemble with trees fitted on the new observations only
+            model = self.sales_model
+            model.set_params(warm_start=True, n_estimators=len(model.estimators_) + INCREMENTAL_TREES)
+            model.fit(X, y)
+            if len(model.estimators_) > MAX_TREES:
+                model.estimators_ = model.estimators_[-MAX_TREES:]
+                model.set_params(n_estimators=MAX_TREES)
+            
+            state['last_date'] = new_data['date'].max()
+            state['updates'] += 1
+            state['fingerprint'] = sales_fingerprint(full_data)
+            if product_line and self.registry:
+                self.registry.put(product_line, SALES_SCHEMA, state['fingerprint'],
+                                  {'model': model, 'scaler': self.scaler, 'state': state})
+            return 'incremental'
+        except Exception as e:
+            print(f"Error updating sales forecasting model: {e}")
+            return 'failed'
+    
+    def _fit_price_trend(self, prices, last_period):
+        """Fit the monthly price trend and keep the sums needed to extend it online"""
+        y = np.asarray(prices, dtype=float)
+        x = np.arange(len(y), dtype=float)
+        model = sklearn.linear_model.LinearRegression()
+        model.fit(x.reshape(-1, 1), y)
+        state = {
+            'sums': [len(y), x.sum(), y.sum(), (x * x).sum(), (x * y).sum()],
+            'series': y[-PRICE_REFIT_WINDOW * 5:].tolist(),
+            'last_period': last_period,
+            'baseline_error': mean_relative_error(y, model.predict(x.reshape(-1, 1))),
+            'updates': 0
+        }
+        return {'model': model, 'periods': len(y), 'state': state}
+    
+    def update_price_model(self, new_data, product_line=None, history=None):
+        """Extend the monthly price trend with months newer than its last fit.
+        With `history`, the trend to extend is the current one or the registered one fitted on exactly
+        that history; without a match it is refit on `history` plus the new rows.
+        The regression is updated exactly from running sums, in time proportional to the new months.
+        If its error on the new months exceeds twice the training error, it is refit on the
+        last PRICE_REFIT_WINDOW months only.
+        Returns 'unchanged', 'incremental', 'retrained' or 'failed'."""
+        try:
+            full_data = new_data if history is None else pd.concat([history, new_data], ignore_index=True)
+            full_monthly = HistoricalContext(product_line, compact_history(full_data)).monthly
+            monthly = HistoricalContext(product_line, new_data).monthly
+            bundle = None
+            if self.price_model is not None and self.price_state is not None:
+                bundle = {'model': self.price_model, 'periods': self.price_state['sums'][0], 'state': self.price_state}
+            if history is not None:
+                history_fingerprint = price_fingerprint(HistoricalContext(product_line,
+                                                                          compact_history(history)).monthly)
+                if bundle is not None and self.price_state.get('fingerprint') != history_fingerprint:
+                    bundle = None
+                if bundle is None and product_line and self.registry:
+                    bundle = self.registry.get(product_line, PRICE_SCHEMA, history_fingerprint)
+            
+            if bundle is None or 'state' not in bundle:
+                if full_monthly.empty:
+                    return 'failed'
+                bundle = self._fit_price_trend(full_monthly['price'], str(full_monthly['date'].iloc[-1]))
+                status = 'retrained'
+            else:
+                state = dict(bundle['state'])
+                monthly = monthly[monthly['date'].astype(str) > state['last_period']]
+                if monthly.empty:
+                    return 'unchanged'
+                y = monthly['price'].to_numpy(dtype=float)
+                n, sx, sy, sxx, sxy = state['sums']
+                x = np.arange(n, n + len(y), dtype=float)
+                
+                # Drift check: relative error of the current trend on the new months
+                error = mean_relative_error(y, bundle['model'].predict(x.reshape(-1, 1)))
+                series = state['series'] + y.tolist()
+                last_period = str(monthly['date'].iloc[-1])
+                if error > max(2 * state['baseline_error'], 0.01):
+                    print(f"Price trend drift detected (error {error:.3f} vs {state['baseline_error']:.3f}); refitting")
+                    bundle, status = self._fit_price_trend(series[-PRICE_REFIT_WINDOW:], last_period), 'retrained'
+                else:
+                    # Exact least-squares update from the running sums
+                    n, sx, sy = n + len(y), sx + x.sum(), sy + y.sum()
+                    sxx, sxy = sxx + (x * x).sum(), sxy + (x * y).sum()
+                    slope = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+                    model = bundle['model']
+                    model.coef_ = np.array([slope])
+                    model.intercept_ = (sy - slope * sx) / n
+                    state.update(sums=[n, sx, sy, sxx, sxy], series=series[-PRICE_REFIT_WINDOW * 5:],
+                                 last_period=last_period, updates=state['updates'] + 1)
+                    bundle, status = {'model': model, 'periods': int(n), 'state': state}, 'incremental'
+            
+            # Registered under the history it now covers, so a forecast on that history reuses it
+            bundle['state'] = dict(bundle['state'], fingerprint=price_fingerprint(full_monthly))
+            self.price_model, self.price_state = bundle['model'], bundle['state']
+            if product_line and self.registry:
+                self.registry.put(product_line, PRICE_SCHEMA, bundle['state']['fingerprint'], bundle)
+            return status
+        except Exception as e:
+            print(f"Error updating price model: {e}")
+            return 'failed'
+    
+    def _registry_for(self, context):
+        """The model registry, or None when the context's history could never be seen again"""
+        return self.registry if context.reusable else None
+    
+    def update_models(self, product_line, new_data, history=None):
+        """Incrementally update the sales and price models with newly observed daily data"""
+        return {
+            'sales': self.update_sales_model(new_data, product_line, history),
+            'price': self.update_price_model(new_data, product_line, history)
+        }
+    
+    def predict_sales_forecast(self, product_line, months_ahead=12, rng=None, context=None, engine=None):
+        """Predict sales for future months.
+        With the 'ets' engine, min_sales and max_sales are the 95% prediction interval."""
+        try:
+            # Separate streams for history and forecast noise, so a registry hit doesn't shift the forecast
+            data_rng, rng = (rng or self.rng).spawn(2)
+            if self._engine(engine) == 'ets':
+                if context is None:
+                    context = self.build_context(product_line, months=24, rng=data_rng)
+                if context.empty:
                     return None
+                mean, lower, upper = holt_winters(context.monthly['avg_sales'].to_numpy(), months_ahead)
+                return [
+                    {
+                        'month': label,
+                        'predicted_sales': int(max(mean_sales, 0)),
+                        'min_sales': int(max(low, 0)),
+                        'max_sales': int(max(high, 0))
+                    }
+                    for label, mean_sales, low, high in zip(forecast_months(months_ahead), mean, lower, upper)
+                ]
+            
+            if context is None:
+                context = self.build_context(product_line, months=24, rng=data_rng)
+            # Reuses the current or a registered model only if it was trained on exactly this history
+            if not self.train_sales_forecasting_model(context.data,
+                                                      product_line if context.reusable else None):
+                return None
             
-            # Generate future dates
+            # Generate future dates and build the whole feature matrix at once
             future_dates = pd.date_range(start=datetime.now(), 
                                        periods=months_ahead*30, freq='D')
-            
-            predictions = []
-            for date in future_dates:
-                features = np.array([[
-                    date.month,
-                    (date.month - 1) // 3 + 1,
-                    date.weekday(),
-                    random.uniform(50, 300)  # Estimated future price
-                ]])
-                
-                features_scaled = self.scaler.transform(features)
-                prediction = self.sales_model.predict(features_scaled)[0]
-                predictions.append(max(0, int(prediction)))
-            
-            # Aggregate by month
-            monthly_predictions = []
-            for i in range(0, len(predictions), 30):
-                month_predictions = predictions[i:i+30]
-                monthly_predictions.append({
-                    'month': future_dates[i].strftime('%Y-%m'),
-                    'predicted_sales': int(np.mean(month_predictions)),
-                    'min_sales': int(np.min(month_predictions)),
-                    'max_sales': int(np.max(month_predictions))
-                })
+            month = future_dates.month.to_numpy()
+            features = np.column_stack([
+                month,
+                (month - 1) // 3 + 1,
+                future_dates.dayofweek.to_numpy(),
+                rng.uniform(50, 300, len(future_dates))  # Estimated future price
+            ])
+            
+            # One scaler transform and one forest predict call for every day
+            predictions = self.sales_model.predict(self.scaler.transform(features))
+            predictions = np.maximum(predictions.astype(np.int64), 0)
+            
+            # Aggregate by month: each row of the reshaped array is one 30-day block
+            blocks = predictions.reshape(months_ahead, 30)
+            labels = future_dates[::30].strftime('%Y-%m')
+            monthly_predictions = [
+                {
+                    'month': label,
+                    'predicted_sales': int(mean),
+                    'min_sales': int(low),
+                    'max_sales': int(high)
+                }
+                for label, mean, low, high in zip(labels, blocks.mean(axis=1), blocks.min(axis=1), blocks.max(axis=1))
+            ]
             
             return monthly_predictions
         except Exception as e:
             print(f"Error predicting sales forecast: {e}")
             return None
     
-    def predict_market_growth(self, product_line, years_ahead=3):
+    def predict_market_growth(self, product_line, years_ahead=3, rng=None, context=None, engine=None):
         """Predict market growth trends"""
         try:
-            # Generate historical growth data
-            historical_data = self.generate_historical_data(product_line, months=36)
+            data_rng, rng = (rng or self.rng).spawn(2)
+            if self._engine(engine) == 'ets':
+                if context is None:
+                    context = self.build_context(product_line, months=36, rng=data_rng)
+                if context.empty:
+                    return None
+                mean, lower, upper = holt_winters(context.monthly['growth_rate'].to_numpy(), years_ahead * 12)
+                confidence = interval_confidence(mean, lower, upper)
+                return [
+                    {
+                        'period': f"{datetime.now().year + i // 12}-{i % 12 + 1:02d}",
+                        'predicted_growth': max(0, float(mean[i])),
+                        'confidence': float(confidence[i]),
+                        'lower': max(0, float(lower[i])),
+                        'upper': max(0, float(upper[i]))
+                    }
+                    for i in range(years_ahead * 12)
+                ]
+            # Historical growth data, with monthly growth rates precomputed
+            if context is None:
+                context = self.build_context(product_line, months=36, rng=data_rng)
             
-            if historical_data.empty:
+            if context.empty:
                 return None
             
-            # Calculate monthly growth rates
-            monthly_data = historical_data.groupby(historical_data['date'].dt.to_period('M')).agg({
-                'sales': 'sum',
-                'growth_rate': 'mean'
-            }).reset_index()
-            
-            # Train growth prediction model
-            X = np.arange(len(monthly_data)).reshape(-1, 1)
-            y = monthly_data['growth_rate'].values
-            
-            self.growth_model = LinearRegression()
-            self.growth_model.fit(X, y)
+            monthly_data = context.monthly
+            y = monthly_data['growth_rate'].to_numpy(dtype=float)
+            data_fingerprint = fingerprint(y)
+            registry = self._registry_for(context)
+            bundle = registry.get(product_line, GROWTH_SCHEMA, data_fingerprint) if registry else None
+            if bundle is None:
+                # Train growth prediction model
+                X = np.arange(len(monthly_data)).reshape(-1, 1)
+                
+                model = sklearn.linear_model.LinearRegression()
+                model.fit(X, y)
+                bundle = {'model': model, 'periods': len(monthly_data)}
+                if registry:
+                    bundle = registry.put(product_line, GROWTH_SCHEMA, data_fingerprint, bundle)
+            self.growth_model, periods = bundle['model'], bundle['periods']
             
             # Predict future growth
-            future_months = np.arange(len(monthly_data), len(monthly_data) + years_ahead * 12).reshape(-1, 1)
+            future_months = np.arange(periods, periods + years_ahead * 12).reshape(-1, 1)
             growth_predictions = self.growth_model.predict(future_months)
             
             # Format predictions
@@ -167,7 +555,7 @@ class PredictiveAnalytics:
                 growth_forecast.append({
                     'period': f"{year}-{month:02d}",
                     'predicted_growth': max(0, growth),
-                    'confidence': random.uniform(0.7, 0.95)
+                    'confidence': rng.uniform(0.7, 0.95)
                 })
             
             return growth_forecast
@@ -175,9 +563,10 @@ class PredictiveAnalytics:
             print(f"Error predicting market growth: {e}")
             return None
     
-    def predict_competitor_strategy(self, competitors, product_line):
+    def predict_competitor_strategy(self, competitors, product_line, rng=None):
         """Predict competitor strategies and moves"""
         try:
+            rng = rng or self.rng
             strategies = []
             
             for competitor in competitors:
@@ -196,21 +585,21 @@ class PredictiveAnalytics:
                 
                 predicted_strategies = []
                 for _ in range(3):  # Predict top 3 strategies
-                    strategy = random.choices(strategy_types, weights=weights)[0]
-                    probability = random.uniform(0.6, 0.95)
-                    timeline = random.choice(['Q1 2024', 'Q2 2024', 'Q3 2024', 'Q4 2024'])
+                    strategy = str(rng.choice(strategy_types, p=weights))
+                    probability = rng.uniform(0.6, 0.95)
+                    timeline = str(rng.choice(['Q1 2024', 'Q2 2024', 'Q3 2024', 'Q4 2024']))
                     
                     predicted_strategies.append({
                         'strategy': strategy,
                         'probability': probability,
                         'timeline': timeline,
-                        'impact': random.choice(['High', 'Medium', 'Low'])
+                        'impact': str(rng.choice(['High', 'Medium', 'Low']))
                     })
                 
                 strategies.append({
                     'competitor': competitor,
                     'predicted_strategies': predicted_strategies,
-                    'risk_level': random.choice(['High', 'Medium', 'Low']),
+                    'risk_level': str(rng.choice(['High', 'Medium', 'Low'])),
                     'recommended_response': self._generate_competitive_response(strategy)
                 })
             
@@ -231,29 +620,51 @@ class PredictiveAnalytics:
         }
         return responses.get(strategy, 'Monitor closely and adapt strategy accordingly')
     
-    def predict_price_trends(self, product_line, months_ahead=12):
+    def predict_price_trends(self, product_line, months_ahead=12, rng=None, context=None, engine=None):
         """Predict price trends and fluctuations"""
         try:
-            # Generate historical price data
-            historical_data = self.generate_historical_data(product_line, months=24)
+            data_rng, rng = (rng or self.rng).spawn(2)
+            if self._engine(engine) == 'ets':
+                if context is None:
+                    context = self.build_context(product_line, months=24, rng=data_rng)
+                if context.empty:
+                    return None
+                mean, lower, upper = holt_winters(context.monthly['price'].to_numpy(), months_ahead)
+                confidence = interval_confidence(mean, lower, upper)
+                return [
+                    {
+                        'month': label,
+                        'predicted_price': round(float(mean[i]), 2),
+                        'trend': 'Increasing' if i > 0 and mean[i] > mean[i - 1] else 'Decreasing',
+                        'confidence': float(confidence[i]),
+                        'lower': round(float(lower[i]), 2),
+                        'upper': round(float(upper[i]), 2)
+                    }
+                    for i, label in enumerate(forecast_months(months_ahead))
+                ]
+            # Historical price data, with monthly mean prices precomputed
+            if context is None:
+                context = self.build_context(product_line, months=24, rng=data_rng)
             
-            if historical_data.empty:
+            if context.empty:
                 return None
             
-            # Calculate price trends
-            monthly_prices = historical_data.groupby(historical_data['date'].dt.to_period('M')).agg({
-                'price': 'mean'
-            }).reset_index()
-            
-            # Train price prediction model
-            X = np.arange(len(monthly_prices)).reshape(-1, 1)
-            y = monthly_prices['price'].values
-            
-            self.price_model = LinearRegression()
-            self.price_model.fit(X, y)
+            monthly_prices = context.monthly
+            y = monthly_prices['price'].to_numpy(dtype=float)
+            data_fingerprint = price_fingerprint(monthly_prices)
+            registry = self._registry_for(context)
+            bundle = registry.get(product_line, PRICE_SCHEMA, data_fingerprint) if registry else None
+            if bundle is None:
+                # Train price prediction model
+                bundle = self._fit_price_trend(y, str(monthly_prices['date'].iloc[-1]))
+                if registry:
+                    bundle = registry.put(product_line, PRICE_SCHEMA, data_fingerprint, bundle)
+            self.price_model, periods = bundle['model'], bundle['periods']
+            state = bundle.get('state')
+            self.price_state = dict(state, fingerprint=data_fingerprint) if state else None
             
             # Predict future prices
-            future_months = np.arange(len(monthly_prices), len(monthly_prices) + months_ahead).reshape(-1, 1)
+            future_months = np.arange(periods, periods + months_ahead).reshape(-1, 1)
             price_predictions = self.price_model.predict(future_months)
             
             # Add seasonal variations
@@ -264,14 +675,14 @@ class PredictiveAnalytics:
                 adjusted_price = base_price * seasonal_adjustment
                 
                 # Add volatility
-                volatility = random.uniform(0.95, 1.05)
+                volatility = rng.uniform(0.95, 1.05)
                 final_price = adjusted_price * volatility
                 
                 price_forecast.append({
                     'month': (datetime.now() + timedelta(days=30*i)).strftime('%Y-%m'),
                     'predicted_price': round(final_price, 2),
                     'trend': 'Increasing' if i > 0 and final_price > price_forecast[-1]['predicted_price'] else 'Decreasing',
-                    'confidence': random.uniform(0.7, 0.9)
+                    'confidence': rng.uniform(0.7, 0.9)
                 })
             
             return price_forecast
@@ -279,98 +690,213 @@ class PredictiveAnalytics:
             print(f"Error predicting price trends: {e}")
             return None
     
-    def analyze_seasonal_demand(self, product_line):
+    def analyze_seasonal_demand(self, product_line, rng=None, context=None):
         """Analyze seasonal demand patterns"""
         try:
-            # Generate 2 years of historical data
-            historical_data = self.generate_historical_data(product_line, months=24)
+            data_rng, rng = (rng or self.rng).spawn(2)
+            # 2 years of historical data unless a shared context is given
+            if context is None:
+                context = self.build_context(product_line, months=24, rng=data_rng)
             
-            if historical_data.empty:
+            if context.empty:
                 return None
             
-            # Analyze seasonal patterns
-            seasonal_analysis = {}
-            
-            # Monthly patterns
-            monthly_demand = historical_data.groupby(historical_data['date'].dt.month).agg({
-                'sales': 'mean'
-            }).reset_index()
-            
-            seasonal_analysis['monthly_patterns'] = []
-            for _, row in monthly_demand.iterrows():
-                seasonal_analysis['monthly_patterns'].append({
-                    'month': row['date'],
-                    'avg_demand': int(row['sales']),
-                    'season': self._get_season(row['date'])
-                })
-            
-            # Quarterly patterns
-            quarterly_demand = historical_data.groupby(historical_data['date'].dt.quarter).agg({
-                'sales': 'mean'
-            }).reset_index()
-            
-            seasonal_analysis['quarterly_patterns'] = []
-            for _, row in quarterly_demand.iterrows():
-                seasonal_analysis['quarterly_patterns'].append({
-                    'quarter': f"Q{int(row['date'])}",
-                    'avg_demand': int(row['sales']),
-                    'peak_season': row['sales'] == quarterly_demand['sales'].max()
-                })
-            
-            # Predict next year's seasonal demand
-            seasonal_analysis['next_year_forecast'] = []
-            for month in range(1, 13):
-                base_demand = monthly_demand[monthly_demand['date'] == month]['sales'].iloc[0]
-                growth_factor = 1 + random.uniform(0.05, 0.15)  # 5-15% growth
-                predicted_demand = int(base_demand * growth_factor)
-                
-                seasonal_analysis['next_year_forecast'].append({
-                    'month': month,
-                    'predicted_demand': predicted_demand,
-                    'season': self._get_season(month),
-                    'recommendation': self._get_seasonal_recommendation(month, predicted_demand)
-                })
+            # Monthly profile; months missing from a short history fall back to the overall average
+            month_of_year = context.month_of_year
+            months = np.arange(1, 13)
+            month_avg = month_of_year.reindex(months).fillna(month_of_year.mean()).to_numpy()
+            quarters, quarter_avg = context.quarter_of_year.index.to_numpy(), context.quarter_of_year.to_numpy()
+            
+            # Next year's demand: the monthly profile with 5-15% growth per month
+            predicted = (month_avg * (1 + rng.uniform(0.05, 0.15, len(months)))).astype(np.int64)
+            recommendations = np.select([predicted > 4000, predicted > 3000],
+                                        [SEASONAL_RECOMMENDATIONS[0], SEASONAL_RECOMMENDATIONS[1]],
+                                        SEASONAL_RECOMMENDATIONS[2])
+            
+            seasonal_analysis = {
+                'monthly_patterns': [
+                    {'month': int(month), 'avg_demand': int(demand), 'season': SEASON_BY_MONTH[month]}
+                    for month, demand in zip(month_of_year.index, month_of_year.to_numpy())
+                ],
+                'quarterly_patterns': [
+                    {'quarter': f"Q{int(quarter)}", 'avg_demand': int(demand), 'peak_season': bool(peak)}
+                    for quarter, demand, peak in zip(quarters, quarter_avg, quarter_avg == quarter_avg.max())
+                ],
+                'next_year_forecast': [
+                    {'month': int(month), 'predicted_demand': int(demand), 'season': SEASON_BY_MONTH[month],
+                     'recommendation': str(recommendation)}
+                    for month, demand, recommendation in zip(months, predicted, recommendations)
+                ]
+            }
             
             return seasonal_analysis
         except Exception as e:
             print(f"Error analyzing seasonal demand: {e}")
             return None
     
-    def _get_season(self, month):
-        """Get season for a given month"""
-        if month in [12, 1, 2]:
-            return 'Winter'
-        elif month in [3, 4, 5]:
-            return 'Spring'
-        elif month in [6, 7, 8]:
-            return 'Summer'
-        else:
-            return 'Fall'
-    
-    def _get_seasonal_recommendation(self, month, demand):
-        """Get recommendation based on seasonal demand"""
-        if demand > 4000:
-            return 'Increase production and marketing efforts'
-        elif demand > 3000:
-            return 'Maintain current production levels'
-        else:
-            return 'Consider promotional activities to boost demand'
-    
-    def generate_comprehensive_forecast(self, product_line, competitors):
-        """Generate comprehensive forecast combining all predictions"""
+    def generate_comprehensive_forecast(self, product_line, competitors, executor=None, history=None, engine=None,
+                                        months_ahead=12, years_ahead=3):
+        """Generate comprehensive forecast combining all predictions.
+        `history` is an optional daily DataFrame to use instead of generated data. A forecast of history seen
+        before (same product line, engine, horizon, data and competitors) is served from the forecast cache."""
         try:
+            engine = self._engine(engine)
+            # Each component gets its own random stream, so results don't depend on scheduling
+            context_rng, sales_rng, growth_rng, competitor_rng, price_rng, seasonal_rng = self.rng.spawn(6)
+            data, reusable = self._history(product_line, rng=context_rng, data=history)
+            horizon = (months_ahead, years_ahead)
+            cache = self.forecast_cache if reusable and not data.empty else None
+            if cache:
+                data_fingerprint = forecast_fingerprint(data, competitors)
+                cached = cache.get(product_line, engine, horizon, data_fingerprint)
+                if cached is not None:
+                    return cached
+            # One history and one set of aggregates shared by every component
+            context = HistoricalContext(product_line, data, reusable=reusable)
+            components = run_components({
+                'sales_forecast': lambda: self.predict_sales_forecast(product_line, months_ahead, rng=sales_rng,
+                                                                      context=context, engine=engine),
+                'market_growth': lambda: self.predict_market_growth(product_line, years_ahead, rng=growth_rng,
+                                                                    context=context, engine=engine),
+                'competitor_strategies': lambda: self.predict_competitor_strategy(competitors, product_line,
+                                                                                  rng=competitor_rng),
+                'price_trends': lambda: self.predict_price_trends(product_line, months_ahead, rng=price_rng,
+                                                                  context=context, engine=engine),
+                'seasonal_analysis': lambda: self.analyze_seasonal_demand(product_line, rng=seasonal_rng,
+                                                                          context=context)
+            }, executor=executor or self.executor, max_workers=self.max_workers)
+            
             forecast = {
                 'product_line': product_line,
                 'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'sales_forecast': self.predict_sales_forecast(product_line),
-                'market_growth': self.predict_market_growth(product_line),
-                'competitor_strategies': self.predict_competitor_strategy(competitors, product_line),
-                'price_trends': self.predict_price_trends(product_line),
-                'seasonal_analysis': self.analyze_seasonal_demand(product_line)
+                'engine': engine,
+                **components
             }
             
+            # Only complete forecasts are cached; a failed component is retried on the next call
+            if cache and all(value is not None for value in components.values()):
+                cache.put(product_line, engine, horizon, data_fingerprint, forecast)
             return forecast
         except Exception as e:
             print(f"Error generating comprehensive forecast: {e}")
             return None
-
+    
+    def generate_panel_forecast(self, product_lines=None, histories=None, months_ahead=12, years_ahead=3,
+                                engine=None):
+        """Forecast many product lines in one call.
+        `histories` is a daily DataFrame with a 'product_line' column or a {product_line: DataFrame}
+        dict; without it, history is generated for each of `product_lines`. With the 'forest' engine, sales
+        come from a single forest fitted on every series (sales and price scaled by each series' mean, series
+        encoded as a feature) and growth and price trends are per-series least-squares fits computed as
+        matrix operations; the 'ets' engine fits Holt-Winters to every monthly series at once and adds
+        'lower'/'upper' interval bounds.
+        Returns {product_line: {'sales_forecast', 'market_growth', 'price_trends', 'seasonal_profile'}}."""
+        try:
+            engine = self._engine(engine)
+            if histories is None:
+                streams = self.rng.spawn(len(product_lines))
+                histories = {line: self.generate_historical_data(line, HISTORY_MONTHS, rng)
+                             for line, rng in zip(product_lines, streams)}
+            if isinstance(histories, dict):
+                histories = pd.concat([frame.assign(product_line=line) for line, frame in histories.items()],
+                                      ignore_index=True)
+            if histories.empty:
+                return {}
+            data = compact_history(histories)
+            names = list(data['product_line'].cat.categories)
+            series = data['product_line'].cat.codes.to_numpy()
+            count = len(names)
+            rng = self.rng.spawn(1)[0]
+            labels = forecast_months(months_ahead)
+            growth_labels = [f"{datetime.now().year + i // 12}-{i % 12 + 1:02d}" for i in range(years_ahead * 12)]
+            
+            # Series x calendar-month matrices of mean daily sales, growth rate and price
+            monthly = data.groupby([series, data['date'].dt.to_period('M')])[['sales', 'growth_rate', 'price']].mean()
+            avg_sales, growth, prices = (monthly[column].unstack().to_numpy(dtype=float)
+                                         for column in ('sales', 'growth_rate', 'price'))
+            periods = growth.shape[1]
+            growth_bounds = price_bounds = None
+            
+            if engine == 'ets':
+                # Non-finite values would wrap around when cast to int; treat them as no sales
+                sales_mean, sales_min, sales_max = (np.maximum(np.where(np.isfinite(values), values, 0), 0)
+                                                    .astype(np.int64)
+                                                    for values in holt_winters(avg_sales, months_ahead))
+                growth_forecast, *growth_bounds = (np.maximum(values, 0)
+                                                   for values in holt_winters(growth, years_ahead * 12))
+                price_forecast, *price_bounds = (values.round(2) for values in holt_winters(prices, months_ahead))
+            else:
+                # Sales: one model over every series, on targets scaled by each series' mean
+                sales_level = data.groupby(series)['sales'].mean().to_numpy()
+                price_level = data.groupby(series)['price'].mean().to_numpy()
+                X = np.column_stack([data['month'], data['quarter'], data['day_of_week'],
+                                     data['price'].to_numpy() / price_level[series], series])
+                y = data['sales'].to_numpy() / sales_level[series]
+                model = sklearn.ensemble.RandomForestRegressor(n_estimators=100, random_state=42, min_samples_leaf=5,
+                                                               max_samples=min(1.0, PANEL_MAX_SAMPLES / len(y)),
+                                                               n_jobs=self.n_jobs if self.n_jobs is not None else -1)
+                model.fit(X, y)
+                
+                # One predict call for every (series, future day)
+                future_dates = pd.date_range(start=datetime.now(), periods=months_ahead*30, freq='D')
+                days = len(future_dates)
+                month = future_dates.month.to_numpy()
+                future = np.column_stack([
+                    np.tile(month, count),
+                    np.tile((month - 1) // 3 + 1, count),
+                    np.tile(future_dates.dayofweek.to_numpy(), count),
+                    rng.uniform(0.9, 1.1, count * days),  # Estimated future price relative to the series mean
+                    np.repeat(np.arange(count), days)
+                ])
+                daily = model.predict(future).reshape(count, months_ahead, 30) * sales_level[:, None, None]
+                daily = np.maximum(daily.astype(np.int64), 0)
+                sales_mean, sales_min, sales_max = daily.mean(axis=2), daily.min(axis=2), daily.max(axis=2)
+                
+                # Growth and price: per-series linear trends over calendar months, fitted together
+                slopes, intercepts = batched_linear_trend(growth)
+                growth_steps = periods + np.arange(years_ahead * 12)
+                growth_forecast = np.maximum(intercepts[:, None] + slopes[:, None] * growth_steps, 0)
+                
+                slopes, intercepts = batched_linear_trend(prices)
+                steps = np.arange(months_ahead)
+                price_forecast = ((intercepts[:, None] + slopes[:, None] * (periods + steps))
+                                  * (1 + 0.1 * np.sin(2 * np.pi * steps / 12))
+                                  * rng.uniform(0.95, 1.05, (count, months_ahead))).round(2)
+            rising = np.zeros_like(price_forecast, dtype=bool)
+            rising[:, 1:] = np.diff(price_forecast, axis=1) > 0
+            
+            month_profile, _ = seasonal_profiles(data.assign(product_line=series))
+            month_profile = month_profile.reindex(columns=range(1, 13))
+            
+            def bounds(interval, i, j):
+                if interval is None:
+                    return {}
+                return {'lower': float(interval[0][i, j]), 'upper': float(interval[1][i, j])}
+            
+            return {
+                name: {
+                    'sales_forecast': [
+                        {'month': label, 'predicted_sales': int(sales_mean[i, j]),
+                         'min_sales': int(sales_min[i, j]), 'max_sales': int(sales_max[i, j])}
+                        for j, label in enumerate(labels)
+                    ],
+                    'market_growth': [
+                        {'period': label, 'predicted_growth': float(growth_forecast[i, j]),
+                         **bounds(growth_bounds, i, j)}
+                        for j, label in enumerate(growth_labels)
+                    ],
+                    'price_trends': [
+                        {'month': label, 'predicted_price': float(price_forecast[i, j]),
+                         'trend': 'Increasing' if rising[i, j] else 'Decreasing', **bounds(price_bounds, i, j)}
+                        for j, label in enumerate(labels)
+                    ],
+                    'seasonal_profile': {
+                        int(month): (None if np.isnan(value) else int(value))
+                        for month, value in month_profile.loc[i].items()
+                    }
+                }
+                for i, name in enumerate(names)
+            }
+        except Exception as e:
+            print(f"Error generating panel forecast: {e}")
+            return None
@@ -2,26 +2,32 @@ import numpy as np
 import random
 from datetime import datetime, timedelta
 import json
+from utils.parallel import run_components
 
 class SimplePredictiveAnalytics:
     """Simplified predictive analytics class for market analysis"""
     
-    def __init__(self):
-        self.random_seed = 42
-        random.seed(self.random_seed)
-        np.random.seed(self.random_seed)
+    def __init__(self, seed=42, executor=None, max_workers=1):
+        self.random_seed = seed
+        # Instance-level generator; components draw from their own child generators
+        self.rng = random.Random(self.random_seed)
+        # Components take well under a millisecond each, less than starting a thread pool, so they
+        # run one after another unless an executor or max_workers > 1 is given
+        self.executor = executor
+        self.max_workers = max_workers
     
-    def generate_historical_data(self, product_line, months=24):
+    def generate_historical_data(self, product_line, months=24, rng=None):
         """Generate historical data for analysis"""
         try:
+            rng = rng or self.rng
             data = []
             base_date = datetime.now() - timedelta(days=months*30)
             
             for i in range(months):
                 date = base_date + timedelta(days=i*30)
-                sales = random.randint(1000, 5000)
-                price = random.uniform(50, 200)
-                sentiment = random.uniform(0.3, 0.9)
+                sales = rng.randint(1000, 5000)
+                price = rng.uniform(50, 200)
+                sentiment = rng.uniform(0.3, 0.9)
                 
                 data.append({
                     'date': date.strftime('%Y-%m-%d'),
@@ -35,11 +41,12 @@ class SimplePredictiveAnalytics:
             print(f"Error generating historical data: {e}")
             return []
     
-    def predict_sales_forecast(self, product_line, months=12):
+    def predict_sales_forecast(self, product_line, months=12, rng=None):
         """Predict sales forecast for the next months"""
         try:
+            rng = rng or self.rng
             # Generate historical data
-            historical_data = self.generate_historical_data(product_line)
+            historical_data = self.generate_historical_data(product_line, rng=rng)
             
             if not historical_data:
                 return []
@@ -55,12 +62,12 @@ class SimplePredictiveAnalytics:
             
             for i in range(1, months + 1):
                 forecast_date = current_date + timedelta(days=i*30)
-                predicted_sales = max(0, int(base_sales + trend_factor * (len(sales_trend) + i) + random.uniform(-200, 200)))
+                predicted_sales = max(0, int(base_sales + trend_factor * (len(sales_trend) + i) + rng.uniform(-200, 200)))
                 
                 forecast.append({
                     'month': forecast_date.strftime('%Y-%m'),
                     'predicted_sales': predicted_sales,
-                    'confidence': random.uniform(0.7, 0.95)
+                    'confidence': rng.uniform(0.7, 0.95)
                 })
             
             return forecast
@@ -68,9 +75,10 @@ class SimplePredictiveAnalytics:
             print(f"Error predicting sales forecast: {e}")
             return []
     
-    def predict_market_growth(self, product_line, periods=36):
+    def predict_market_growth(self, product_line, periods=36, rng=None):
         """Predict market growth over time"""
         try:
+            rng = rng or self.rng
             growth_rates = []
             current_date = datetime.now()
             
@@ -81,7 +89,7 @@ class SimplePredictiveAnalytics:
                 # Base growth rate with seasonal variation
                 base_growth = 0.05  # 5% base growth
                 seasonal_factor = 0.02 * np.sin(2 * np.pi * i / 12)  # Seasonal variation
-                random_factor = random.uniform(-0.01, 0.01)
+                random_factor = rng.uniform(-0.01, 0.01)
                 
                 growth_rate = max(-0.1, min(0.2, base_growth + seasonal_factor + random_factor))
                 
@@ -96,9 +104,10 @@ class SimplePredictiveAnalytics:
             print(f"Error predicting market growth: {e}")
             return []
     
-    def predict_competitor_strategy(self, competitors):
+    def predict_competitor_strategy(self, competitors, rng=None):
         """Predict competitor strategies"""
         try:
+            rng = rng or self.rng
             strategies = []
             strategy_types = [
                 'Price Reduction', 'Product Innovation', 'Market Expansion',
@@ -109,15 +118,15 @@ class SimplePredictiveAnalytics:
                 predicted_strategies = []
                 
                 # Predict 2-4 strategies per competitor
-                num_strategies = random.randint(2, 4)
-                selected_strategies = random.sample(strategy_types, num_strategies)
+                num_strategies = rng.randint(2, 4)
+                selected_strategies = rng.sample(strategy_types, num_strategies)
                 
                 for strategy in selected_strategies:
                     predicted_strategies.append({
                         'strategy': strategy,
-                        'probability': random.uniform(0.3, 0.9),
-                        'timeline': random.choice(['Immediate', '3 months', '6 months', '12 months']),
-                        'impact': random.choice(['Low', 'Medium', 'High'])
+                        'probability': rng.uniform(0.3, 0.9),
+                        'timeline': rng.choice(['Immediate', '3 months', '6 months', '12 months']),
+                        'impact': rng.choice(['Low', 'Medium', 'High'])
                     })
                 
                 # Determine risk level
@@ -143,7 +152,7 @@ class SimplePredictiveAnalytics:
                     'competitor': competitor,
                     'predicted_strategies': predicted_strategies,
                     'risk_level': risk_level,
-                    'recommended_response': random.choice(responses)
+                    'recommended_response': rng.choice(responses)
                 })
             
             return strategies
@@ -151,12 +160,13 @@ class SimplePredictiveAnalytics:
             print(f"Error predicting competitor strategy: {e}")
             return []
     
-    def predict_price_trends(self, product_line, months=12):
+    def predict_price_trends(self, product_line, months=12, rng=None):
         """Predict price trends over time"""
         try:
+            rng = rng or self.rng
             price_trends = []
             current_date = datetime.now()
-            base_price = random.uniform(100, 150)
+            base_price = rng.uniform(100, 150)
             
             # Generate price trend with inflation and market factors
             for i in range(months):
@@ -164,7 +174,7 @@ class SimplePredictiveAnalytics:
                 
                 # Price trend factors
                 inflation_factor = 0.002 * i  # 0.2% monthly inflation
-                market_factor = random.uniform(-0.01, 0.01)  # Market fluctuations
+                market_factor = rng.uniform(-0.01, 0.01)  # Market fluctuations
                 seasonal_factor = 0.005 * np.sin(2 * np.pi * i / 12)  # Seasonal variation
                 
                 price_change = inflation_factor + market_factor + seasonal_factor
@@ -174,7 +184,7 @@ class SimplePredictiveAnalytics:
                     'month': forecast_date.strftime('%Y-%m'),
                     'predicted_price': round(predicted_price, 2),
                     'price_change': round(price_change * 100, 2),
-                    'confidence': random.uniform(0.6, 0.9)
+                    'confidence': rng.uniform(0.6, 0.9)
                 })
             
             return price_trends
@@ -182,15 +192,16 @@ class SimplePredictiveAnalytics:
             print(f"Error predicting price trends: {e}")
             return []
     
-    def analyze_seasonal_demand(self, product_line):
+    def analyze_seasonal_demand(self, product_line, rng=None):
         """Analyze seasonal demand patterns"""
         try:
+            rng = rng or self.rng
             seasons = ['Q1 (Jan-Mar)', 'Q2 (Apr-Jun)', 'Q3 (Jul-Sep)', 'Q4 (Oct-Dec)']
             seasonal_analysis = []
             
             for i, season in enumerate(seasons):
                 # Generate seasonal demand factors
-                base_demand = random.uniform(0.8, 1.2)
+                base_demand = rng.uniform(0.8, 1.2)
                 seasonal_factor = 1.0 + 0.3 * np.sin(2 * np.pi * i / 4)  # Seasonal pattern
                 
                 demand_level = base_demand * seasonal_factor
@@ -198,7 +209,7 @@ class SimplePredictiveAnalytics:
                 seasonal_analysis.append({
                     'season': season,
                     'demand_level': round(demand_level, 2),
-                    'trend': random.choice(['Increasing', 'Stable', 'Decreasing']),
+                    'trend': rng.choice(['Increasing', 'Stable', 'Decreasing']),
                     'recommendation': self._get_seasonal_recommendation(season, demand_level)
                 })
             
@@ -216,20 +227,27 @@ class SimplePredictiveAnalytics:
         else:
             return "Consider promotional activities to boost demand"
     
-    def generate_comprehensive_forecast(self, product_line, competitors=None):
+    def generate_comprehensive_forecast(self, product_line, competitors=None, executor=None):
         """Generate comprehensive forecast with all predictions"""
         try:
             if not competitors:
                 competitors = ['Competitor A', 'Competitor B', 'Competitor C']
             
+            # Each component gets its own seeded generator, so results don't depend on scheduling
+            sales_rng, growth_rng, competitor_rng, price_rng, seasonal_rng = (
+                random.Random(self.rng.getrandbits(64)) for _ in range(5))
+            components = run_components({
+                'sales_forecast': lambda: self.predict_sales_forecast(product_line, rng=sales_rng),
+                'market_growth': lambda: self.predict_market_growth(product_line, rng=growth_rng),
+                'competitor_strategies': lambda: self.predict_competitor_strategy(competitors, rng=competitor_rng),
+                'price_trends': lambda: self.predict_price_trends(product_line, rng=price_rng),
+                'seasonal_analysis': lambda: self.analyze_seasonal_demand(product_line, rng=seasonal_rng)
+            }, executor=executor or self.executor, max_workers=self.max_workers)
+            
             forecast = {
                 'product_line': product_line,
                 'generated_at': datetime.now().isoformat(),
-                'sales_forecast': self.predict_sales_forecast(product_line),
-                'market_growth': self.predict_market_growth(product_line),
-                'competitor_strategies': self.predict_competitor_strategy(competitors),
-                'price_trends': self.predict_price_trends(product_line),
-                'seasonal_analysis': self.analyze_seasonal_demand(product_line)
+                **components
             }
             
             return forecast
@@ -0,0 +1,93 @@
+"""
+Append-only JSON Lines file with size-based rotation.
+Used for trace spans and the MCP analysis log so that long-running
+processes keep a bounded amount of history on disk.
+"""
+
+import json
+import os
+import threading
+
+
+class RotatingJSONLWriter:
+    """Appends JSON records to a file, rotating it once it exceeds max_bytes."""
+
+    def __init__(self, path, max_bytes=5 * 1024 * 1024, backup_count=5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _backup_path(self, index):
+        return f"{self.path}.{index}"
+
+    def _rotate(self):
+        """Shift path -> path.1 -> path.2 ..., dropping the oldest backup."""
+        if self.backup_count <= 0:
+            os.remove(self.path)
+            return
+        oldest = self._backup_path(self.backup_count)
+        if os.path.exists(oldest):
+            os.remove(oldest)
+        for i in range(self.backup_count - 1, 0, -1):
+            src = self._backup_path(i)
+            if os.path.exists(src):
+                os.replace(src, self._backup_path(i + 1))
+        os.replace(self.path, self._backup_path(1))
+
+    def write(self, record: dict):
+        """Appends one record as a single JSON line."""
+        line = json.dumps(record, default=str, separators=(",", ":")) + "\n"
+        encoded = line.encode("utf-8")
+        with self._lock:
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                size = 0
+            if size and size + len(encoded) > self.max_bytes:
+                self._rotate()
+            with open(self.path, "ab") as f:
+                f.write(encoded)
+
+    def files(self):
+        """Returns existing log files ordered from oldest to newest."""
+        paths = [self._backup_path(i) for i in range(self.backup_count, 0, -1)]
+        paths.append(self.path)
+        return [p for p in paths if os.path.exists(p)]
+
+    def tail(self, n, chunk_size=64 * 1024):
+        """Returns up to the last n records of the current file without reading all of it."""
+        if n <= 0 or not os.path.exists(self.path):
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            buffer = b""
+            while position > 0 and buffer.count(b"\n") <= n:
+                step = min(chunk_size, position)
+                position -= step
+                f.seek(position)
+                buffer = f.read(step) + buffer
+        records = []
+        for line in buffer.splitlines()[-n:]:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        return records
+
+    def iter_records(self):
+        """Yields every stored record, oldest first. Corrupt lines are skipped."""
+        for path in self.files():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
@@ -1,7 +1,9 @@
 import os 
 import requests 
 from serpapi import search 
+from utils.tracing import traced 
  
+@traced("search", "serpapi_web") 
 def search_serpapi(query: str): 
     """ 
     Performs a web search using SerpAPI. 
@@ -28,6 +30,7 @@ def search_serpapi(query: str):
         print(f"Error with SerpAPI: {e}") 
         return "No results found." 
  
+@traced("search", "scrape_reviews") 
 def scrape_reviews(query: str): 
     """ 
     Simulates scraping reviews from a web search. 
@@ -1,4 +1,20 @@
-from transformers import pipeline 
+import threading 
+from utils.tracing import span 
+ 
+_classifier = None 
+_classifier_lock = threading.Lock() 
+ 
+def _get_classifier(): 
+    """ 
+    Builds the sentiment pipeline once, on first use. transformers (and torch) 
+    are imported here rather than at module load to keep start-up fast. 
+    """ 
+    global _classifier 
+    with _classifier_lock: 
+        if _classifier is None: 
+            from transformers import pipeline 
+            _classifier = pipeline("sentiment-analysis") 
+        return _classifier 
  
 def analyze_sentiment(text: str): 
     """ 
@@ -6,8 +22,9 @@ def analyze_sentiment(text: str):
     """ 
     # Use a pre-trained sentiment analysis pipeline 
     try: 
-        classifier = pipeline("sentiment-analysis") 
-        result = classifier(text) 
+        with span("model", "sentiment-analysis", text_chars=len(text)): 
+            classifier = _get_classifier() 
+            result = classifier(text) 
          
         label = result[0]['label'] 
         score = result[0]['score'] 
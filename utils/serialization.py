@@ -0,0 +1,157 @@
+"""
+Serialization codecs for stored snapshots and visualization data.
+
+Payloads can be written as JSON (stdlib or orjson), MessagePack, and
+optionally zstd-compressed. Reads auto-detect the format, so files written
+by older versions (pretty-printed JSON) keep working.
+
+Select the defaults with MARKETMATE_CODEC (auto | json | orjson | msgpack)
+and MARKETMATE_COMPRESSION (none | zstd). "auto" uses orjson when it is
+installed and the stdlib json module otherwise.
+"""
+
+import json
+import os
+import tempfile
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_CODEC = os.getenv("MARKETMATE_CODEC", "auto")
+DEFAULT_COMPRESSION = os.getenv("MARKETMATE_COMPRESSION", "none")
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _to_builtin(value):
+    """Fallback for values the encoders don't know (numpy scalars, dates, ...)."""
+    item = getattr(value, "item", None)
+    if callable(item):
+        try:
+            return item()
+        except (TypeError, ValueError):
+            pass
+    tolist = getattr(value, "tolist", None)
+    if callable(tolist):
+        return tolist()
+    return str(value)
+
+
+def resolve_codec(codec=None):
+    """Maps 'auto' (or None) to the fastest available JSON codec and validates the name."""
+    codec = (codec or DEFAULT_CODEC).lower()
+    if codec == "auto":
+        return "orjson" if orjson is not None else "json"
+    if codec == "orjson" and orjson is None:
+        raise ImportError("orjson is not installed; pip install orjson or use MARKETMATE_CODEC=json")
+    if codec == "msgpack" and msgpack is None:
+        raise ImportError("msgpack is not installed; pip install msgpack or use MARKETMATE_CODEC=json")
+    if codec not in ("json", "orjson", "msgpack"):
+        raise ValueError(f"Unknown codec '{codec}'. Use auto, json, orjson or msgpack.")
+    return codec
+
+
+def resolve_compression(compression=None):
+    compression = (compression or DEFAULT_COMPRESSION).lower()
+    if compression in ("", "none"):
+        return None
+    if compression != "zstd":
+        raise ValueError(f"Unknown compression '{compression}'. Use none or zstd.")
+    if zstandard is None:
+        raise ImportError("zstandard is not installed; pip install zstandard or use MARKETMATE_COMPRESSION=none")
+    return compression
+
+
+def encode(obj, codec=None, compression=None):
+    """Serializes obj to bytes with the given (or default) codec and compression."""
+    codec = resolve_codec(codec)
+    if codec == "orjson":
+        payload = orjson.dumps(obj, default=_to_builtin,
+                               option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    elif codec == "msgpack":
+        payload = msgpack.packb(obj, default=_to_builtin, use_bin_type=True)
+    else:
+        payload = json.dumps(obj, default=_to_builtin, separators=(",", ":")).encode("utf-8")
+
+    if resolve_compression(compression) == "zstd":
+        payload = zstandard.ZstdCompressor(level=3).compress(payload)
+    return payload
+
+
+def _decompress(data: bytes):
+    """Returns (payload, compression) with any zstd frame removed."""
+    if data[:4] != ZSTD_MAGIC:
+        return data, None
+    if zstandard is None:
+        raise ImportError("zstandard is required to read zstd-compressed data")
+    return zstandard.ZstdDecompressor().decompress(data), "zstd"
+
+
+def _is_json(data: bytes):
+    # Snapshots are dicts/lists; MessagePack encodes those with bytes >= 0x80
+    return not data or data.lstrip()[:1] in (b"{", b"[", b'"')
+
+
+def detect_format(data: bytes):
+    """Returns (codec, compression) for an encoded payload."""
+    payload, compression = _decompress(data)
+    return ("json" if _is_json(payload) else "msgpack"), compression
+
+
+def decode(data):
+    """Deserializes bytes produced by encode(), or any plain JSON document."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    data, _ = _decompress(data)
+    if data[:3] == b"\xef\xbb\xbf":
+        data = data[3:]
+    if _is_json(data):
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data.decode("utf-8"))
+    if msgpack is None:
+        raise ImportError("msgpack is required to read MessagePack data")
+    return msgpack.unpackb(data, raw=False)
+
+
+def file_extension(codec=None, compression=None):
+    """File extension matching the codec, e.g. '.json', '.msgpack' or '.json.zst'."""
+    extension = ".msgpack" if resolve_codec(codec) == "msgpack" else ".json"
+    if resolve_compression(compression) == "zstd":
+        extension += ".zst"
+    return extension
+
+
+def dump_file(obj, path, codec=None, compression=None):
+    """Atomically writes obj to path."""
+    payload = encode(obj, codec=codec, compression=compression)
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def load_file(path):
+    """Reads a file written by dump_file() or any JSON file, detecting the format."""
+    with open(path, "rb") as f:
+        return decode(f.read())
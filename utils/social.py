@@ -1,6 +1,8 @@
 import os 
 from serpapi import search 
+from utils.tracing import traced 
  
+@traced("search", "serpapi_news") 
 def get_google_news_trends(query: str): 
     """ 
     Fetches trending news articles related to a query using SerpAPI. 
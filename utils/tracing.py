@@ -0,0 +1,236 @@
+"""
+Structured tracing for MarketMate AI.
+
+Every graph node, search call, LLM call and model inference can be wrapped
+in a span. Finished spans are written as JSON lines to a rotating trace file
+(data/traces/spans.jsonl by default) and can be summarised per stage with:
+
+    python -m utils.tracing [--file PATH] [--run RUN_ID]
+"""
+
+import argparse
+import contextvars
+import functools
+import math
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+from utils.rotating_log import RotatingJSONLWriter
+
+TRACE_FILE = os.getenv("MARKETMATE_TRACE_FILE", os.path.join("data", "traces", "spans.jsonl"))
+TRACE_MAX_BYTES = int(os.getenv("MARKETMATE_TRACE_MAX_BYTES", str(5 * 1024 * 1024)))
+TRACE_BACKUPS = int(os.getenv("MARKETMATE_TRACE_BACKUPS", "5"))
+TRACING_ENABLED = os.getenv("MARKETMATE_TRACING", "1") not in ("0", "false", "False")
+
+_run_id = contextvars.ContextVar("marketmate_run_id", default=None)
+_current_span = contextvars.ContextVar("marketmate_current_span", default=None)
+_writer = None
+_listeners = []
+
+
+def _get_writer():
+    global _writer
+    if _writer is None:
+        _writer = RotatingJSONLWriter(TRACE_FILE, max_bytes=TRACE_MAX_BYTES, backup_count=TRACE_BACKUPS)
+    return _writer
+
+
+def start_run(run_id=None):
+    """Starts a new analysis run; spans created afterwards carry its id."""
+    run_id = run_id or uuid.uuid4().hex[:12]
+    _run_id.set(run_id)
+    return run_id
+
+
+def current_run_id():
+    """Returns the run id of the active analysis run, if any."""
+    return _run_id.get()
+
+
+def add_span_listener(listener):
+    """Registers a callable invoked with every finished span record."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_span_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+class Span:
+    """A single timed operation. Attributes are set while the span is open."""
+
+    def __init__(self, kind, name, attributes=None):
+        self.kind = kind
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        parent = _current_span.get()
+        self.parent_id = parent.span_id if parent else None
+        self.run_id = _run_id.get()
+        self.attributes = dict(attributes or {})
+        self.cache_hit = None
+        self.input_tokens = None
+        self.output_tokens = None
+        self.status = "ok"
+        self.error = None
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self.duration_ms = None
+
+    def set(self, **attributes):
+        """Adds attributes to the span."""
+        self.attributes.update(attributes)
+
+    def set_cache_hit(self, hit: bool):
+        self.cache_hit = bool(hit)
+
+    def record_llm_usage(self, response):
+        """Copies token counts from a LangChain message, when the provider reports them."""
+        usage = getattr(response, "usage_metadata", None) or {}
+        if not usage:
+            metadata = getattr(response, "response_metadata", None) or {}
+            usage = metadata.get("usage_metadata") or metadata.get("token_usage") or {}
+        self.input_tokens = usage.get("input_tokens", usage.get("prompt_token_count"))
+        self.output_tokens = usage.get("output_tokens", usage.get("candidates_token_count"))
+
+    def finish(self, error=None):
+        self.duration_ms = (time.perf_counter() - self._start) * 1000.0
+        if error is not None:
+            self.status = "error"
+            self.error = f"{type(error).__name__}: {error}"
+
+    def to_record(self):
+        end_time = self.start_time + (self.duration_ms or 0.0) / 1000.0
+        return {
+            "run_id": self.run_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "kind": self.kind,
+            "name": self.name,
+            "start": datetime.fromtimestamp(self.start_time).isoformat(),
+            "end": datetime.fromtimestamp(end_time).isoformat(),
+            "duration_ms": round(self.duration_ms or 0.0, 3),
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_hit": self.cache_hit,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+def _emit(span):
+    record = span.to_record()
+    if TRACING_ENABLED:
+        try:
+            _get_writer().write(record)
+        except Exception as e:
+            print(f"[Tracing] -> Failed to write span: {e}")
+    for listener in list(_listeners):
+        try:
+            listener(record)
+        except Exception as e:
+            print(f"[Tracing] -> Span listener failed: {e}")
+
+
+@contextmanager
+def span(kind: str, name: str, **attributes):
+    """Context manager that times the enclosed block as a span."""
+    current = Span(kind, name, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.finish(error=e)
+        raise
+    else:
+        current.finish()
+    finally:
+        _current_span.reset(token)
+        _emit(current)
+
+
+def traced(kind: str, name: str = None):
+    """Decorator that wraps every call of the function in a span."""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(kind, span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def trace_node(name: str):
+    """Decorator for LangGraph node functions."""
+    return traced("node", name)
+
+
+def invoke_llm(llm, prompt_text: str, prompt_type: str):
+    """Invokes the LLM inside an 'llm' span and records token usage."""
+    with span("llm", prompt_type, prompt_chars=len(prompt_text)) as s:
+        response = llm.invoke(prompt_text)
+        s.record_llm_usage(response)
+        return response
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize_spans(records, run_id=None):
+    """Groups span durations by stage ('kind:name') and computes p50/p95/p99."""
+    durations = {}
+    for record in records:
+        if run_id and record.get("run_id") != run_id:
+            continue
+        stage = f"{record.get('kind')}:{record.get('name')}"
+        durations.setdefault(stage, []).append(float(record.get("duration_ms") or 0.0))
+
+    summary = {}
+    for stage, values in durations.items():
+        values.sort()
+        summary[stage] = {
+            "count": len(values),
+            "p50_ms": percentile(values, 50),
+            "p95_ms": percentile(values, 95),
+            "p99_ms": percentile(values, 99),
+            "max_ms": values[-1],
+        }
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-stage latency percentiles from MarketMate trace files.")
+    parser.add_argument("--file", default=TRACE_FILE, help="Trace file (rotated backups are included)")
+    parser.add_argument("--run", default=None, help="Only include spans from this run id")
+    args = parser.parse_args(argv)
+
+    writer = RotatingJSONLWriter(args.file, max_bytes=TRACE_MAX_BYTES, backup_count=TRACE_BACKUPS)
+    summary = summarize_spans(writer.iter_records(), run_id=args.run)
+    if not summary:
+        print(f"No spans found in {args.file}")
+        return 1
+
+    header = f"{'stage':<40} {'count':>7} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for stage, stats in sorted(summary.items(), key=lambda item: -item[1]["p95_ms"]):
+        print(f"{stage:<40} {stats['count']:>7} {stats['p50_ms']:>10.1f} "
+              f"{stats['p95_ms']:>10.1f} {stats['p99_ms']:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,7 +8,10 @@ import json
 class SimpleVisualizer:
     """Simplified visualization class for market analysis data"""
     
-    def __init__(self):
+    def __init__(self, seed=42):
+        # Own seeded generators for the sample data, so charts are reproducible between runs
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed)
         self.colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', 
                       '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
     
@@ -23,7 +26,7 @@ class SimpleVisualizer:
                     if i == len(competitors) - 1:
                         shares.append(total)
                     else:
-                        share = random.randint(5, 30)
+                        share = self.rng.randint(5, 30)
                         shares.append(share)
                         total -= share
                 market_shares = shares
@@ -53,7 +56,7 @@ class SimpleVisualizer:
             # Generate sample sentiment data if not provided
             if not sentiment_data:
                 dates = [datetime.now() - timedelta(days=i*30) for i in range(12, 0, -1)]
-                sentiment_scores = [random.uniform(0.3, 0.9) for _ in range(len(dates))]
+                sentiment_scores = [self.rng.uniform(0.3, 0.9) for _ in range(len(dates))]
             else:
                 dates = sentiment_data.get('dates', [])
                 sentiment_scores = sentiment_data.get('scores', [])
@@ -93,7 +96,7 @@ class SimpleVisualizer:
                 metrics_data = {}
                 
                 for competitor in competitors:
-                    metrics_data[competitor] = [random.randint(60, 95) for _ in range(len(metrics))]
+                    metrics_data[competitor] = [self.rng.randint(60, 95) for _ in range(len(metrics))]
             
             fig = go.Figure()
             
@@ -128,7 +131,7 @@ class SimpleVisualizer:
         try:
             if not price_data:
                 # Generate sample price data
-                price_data = np.random.normal(150, 50, 1000)  # Normal distribution around $150
+                price_data = self.np_rng.normal(150, 50, 1000)  # Normal distribution around $150
             
             fig = go.Figure()
             
@@ -160,7 +163,7 @@ class SimpleVisualizer:
                 # Generate sample location data
                 cities = ['New York', 'Los Angeles', 'Chicago', 'Houston', 'Phoenix', 
                          'Philadelphia', 'San Antonio', 'San Diego', 'Dallas', 'San Jose']
-                market_sizes = [random.randint(1000, 10000) for _ in range(len(cities))]
+                market_sizes = [self.rng.randint(1000, 10000) for _ in range(len(cities))]
                 location_data = list(zip(cities, market_sizes))
             
             # Create a simple scatter plot on a map using Plotly